@@ -0,0 +1,430 @@
+// Compression benchmark over the codecs packaged in this index.
+//
+// Every codec runs on the same in-memory corpora (generated deterministically, plus any
+// files given with --file). Ratio and compress/decompress throughput are reported on
+// stdout and written as CSV and JSON.
+
+#include <algorithm>
+#include <chrono>
+#include <cstdint>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <fstream>
+#include <functional>
+#include <iostream>
+#include <iterator>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+#include <zlib.h>
+#include <bzlib.h>
+#include <lzma.h>
+#include <lz4.h>
+#include <lz4hc.h>
+#include <zstd.h>
+#include <brotli/encode.h>
+#include <brotli/decode.h>
+#include <snappy.h>
+#include <lzo1x.h>
+
+namespace {
+
+typedef std::vector<unsigned char> Buffer;
+
+struct Codec {
+    std::string library;
+    std::string level;
+    // Returns the compressed size written to dst
+    std::function<size_t(const Buffer& src, Buffer& dst)> compress;
+    // Decompresses src[0, srcSize) into dst, which is already sized to the original length
+    std::function<void(const unsigned char* src, size_t srcSize, Buffer& dst)> decompress;
+};
+
+struct Corpus {
+    std::string name;
+    Buffer data;
+};
+
+struct Result {
+    std::string corpus;
+    std::string library;
+    std::string level;
+    size_t original;
+    size_t compressed;
+    double compress_mb_s;
+    double decompress_mb_s;
+};
+
+void check(bool ok, const std::string& what)
+{
+    if (!ok)
+        throw std::runtime_error(what);
+}
+
+std::vector<Codec> make_codecs()
+{
+    std::vector<Codec> codecs;
+
+    for (int level : {1, 6, 9}) {
+        codecs.push_back({"zlib", std::to_string(level),
+            [level](const Buffer& src, Buffer& dst) {
+                uLongf dstLen = compressBound(static_cast<uLong>(src.size()));
+                dst.resize(dstLen);
+                check(compress2(dst.data(), &dstLen, src.data(), static_cast<uLong>(src.size()), level) == Z_OK, "zlib compress");
+                return static_cast<size_t>(dstLen);
+            },
+            [](const unsigned char* src, size_t srcSize, Buffer& dst) {
+                uLongf dstLen = static_cast<uLongf>(dst.size());
+                check(uncompress(dst.data(), &dstLen, src, static_cast<uLong>(srcSize)) == Z_OK, "zlib uncompress");
+            }});
+    }
+
+    codecs.push_back({"bzip2", "9",
+        [](const Buffer& src, Buffer& dst) {
+            unsigned int dstLen = static_cast<unsigned int>(src.size() + src.size() / 100 + 600);
+            dst.resize(dstLen);
+            check(BZ2_bzBuffToBuffCompress(reinterpret_cast<char*>(dst.data()), &dstLen,
+                                           const_cast<char*>(reinterpret_cast<const char*>(src.data())),
+                                           static_cast<unsigned int>(src.size()), 9, 0, 0) == BZ_OK, "bzip2 compress");
+            return static_cast<size_t>(dstLen);
+        },
+        [](const unsigned char* src, size_t srcSize, Buffer& dst) {
+            unsigned int dstLen = static_cast<unsigned int>(dst.size());
+            check(BZ2_bzBuffToBuffDecompress(reinterpret_cast<char*>(dst.data()), &dstLen,
+                                             const_cast<char*>(reinterpret_cast<const char*>(src)),
+                                             static_cast<unsigned int>(srcSize), 0, 0) == BZ_OK, "bzip2 decompress");
+        }});
+
+    for (uint32_t preset : {0u, 6u}) {
+        codecs.push_back({"xz", std::to_string(preset),
+            [preset](const Buffer& src, Buffer& dst) {
+                size_t dstPos = 0;
+                dst.resize(lzma_stream_buffer_bound(src.size()));
+                check(lzma_easy_buffer_encode(preset, LZMA_CHECK_CRC64, nullptr, src.data(), src.size(),
+                                              dst.data(), &dstPos, dst.size()) == LZMA_OK, "xz compress");
+                return dstPos;
+            },
+            [](const unsigned char* src, size_t srcSize, Buffer& dst) {
+                uint64_t memlimit = UINT64_MAX;
+                size_t srcPos = 0;
+                size_t dstPos = 0;
+                check(lzma_stream_buffer_decode(&memlimit, 0, nullptr, src, &srcPos, srcSize,
+                                                dst.data(), &dstPos, dst.size()) == LZMA_OK, "xz decompress");
+            }});
+    }
+
+    for (int level : {1, 9}) {
+        codecs.push_back({"lz4", level == 1 ? "fast" : "hc" + std::to_string(level),
+            [level](const Buffer& src, Buffer& dst) {
+                const int srcSize = static_cast<int>(src.size());
+                dst.resize(LZ4_compressBound(srcSize));
+                const char* in = reinterpret_cast<const char*>(src.data());
+                char* out = reinterpret_cast<char*>(dst.data());
+                const int dstSize = level == 1
+                    ? LZ4_compress_default(in, out, srcSize, static_cast<int>(dst.size()))
+                    : LZ4_compress_HC(in, out, srcSize, static_cast<int>(dst.size()), level);
+                check(dstSize > 0, "lz4 compress");
+                return static_cast<size_t>(dstSize);
+            },
+            [](const unsigned char* src, size_t srcSize, Buffer& dst) {
+                const int decoded = LZ4_decompress_safe(reinterpret_cast<const char*>(src), reinterpret_cast<char*>(dst.data()),
+                                                        static_cast<int>(srcSize), static_cast<int>(dst.size()));
+                check(decoded == static_cast<int>(dst.size()), "lz4 decompress");
+            }});
+    }
+
+    for (int level : {1, 3, 19}) {
+        codecs.push_back({"zstd", std::to_string(level),
+            [level](const Buffer& src, Buffer& dst) {
+                dst.resize(ZSTD_compressBound(src.size()));
+                const size_t dstSize = ZSTD_compress(dst.data(), dst.size(), src.data(), src.size(), level);
+                check(!ZSTD_isError(dstSize), "zstd compress");
+                return dstSize;
+            },
+            [](const unsigned char* src, size_t srcSize, Buffer& dst) {
+                const size_t decoded = ZSTD_decompress(dst.data(), dst.size(), src, srcSize);
+                check(!ZSTD_isError(decoded) && decoded == dst.size(), "zstd decompress");
+            }});
+    }
+
+    for (int quality : {1, 5, 11}) {
+        codecs.push_back({"brotli", std::to_string(quality),
+            [quality](const Buffer& src, Buffer& dst) {
+                size_t dstSize = BrotliEncoderMaxCompressedSize(src.size());
+                dst.resize(dstSize);
+                check(BrotliEncoderCompress(quality, BROTLI_DEFAULT_WINDOW, BROTLI_MODE_GENERIC, src.size(), src.data(),
+                                            &dstSize, dst.data()) == BROTLI_TRUE, "brotli compress");
+                return dstSize;
+            },
+            [](const unsigned char* src, size_t srcSize, Buffer& dst) {
+                size_t dstSize = dst.size();
+                check(BrotliDecoderDecompress(srcSize, src, &dstSize, dst.data()) == BROTLI_DECODER_RESULT_SUCCESS,
+                      "brotli decompress");
+            }});
+    }
+
+    codecs.push_back({"snappy", "default",
+        [](const Buffer& src, Buffer& dst) {
+            size_t dstSize = 0;
+            dst.resize(snappy::MaxCompressedLength(src.size()));
+            snappy::RawCompress(reinterpret_cast<const char*>(src.data()), src.size(), reinterpret_cast<char*>(dst.data()), &dstSize);
+            return dstSize;
+        },
+        [](const unsigned char* src, size_t srcSize, Buffer& dst) {
+            check(snappy::RawUncompress(reinterpret_cast<const char*>(src), srcSize, reinterpret_cast<char*>(dst.data())),
+                  "snappy decompress");
+        }});
+
+    codecs.push_back({"lzo", "1x_1",
+        [](const Buffer& src, Buffer& dst) {
+            Buffer workmem(LZO1X_1_MEM_COMPRESS);
+            lzo_uint dstSize = 0;
+            dst.resize(src.size() + src.size() / 16 + 64 + 3);
+            check(lzo1x_1_compress(const_cast<unsigned char*>(src.data()), src.size(), dst.data(), &dstSize, workmem.data()) == LZO_E_OK,
+                  "lzo compress");
+            return static_cast<size_t>(dstSize);
+        },
+        [](const unsigned char* src, size_t srcSize, Buffer& dst) {
+            lzo_uint dstSize = dst.size();
+            check(lzo1x_decompress_safe(const_cast<unsigned char*>(src), srcSize, dst.data(), &dstSize, nullptr) == LZO_E_OK,
+                  "lzo decompress");
+        }});
+
+    return codecs;
+}
+
+uint32_t xorshift(uint32_t& state)
+{
+    state ^= state << 13;
+    state ^= state >> 17;
+    state ^= state << 5;
+    return state;
+}
+
+// Log-like text records
+Buffer generate_text(size_t size)
+{
+    static const char* const words[] = {
+        "INFO", "WARN", "ERROR", "request", "response", "latency_ms=", "user=", "session=",
+        "GET", "POST", "/api/v1/items", "/api/v1/users", "status=200", "status=404", "bytes=",
+        "cache", "hit", "miss", "upstream", "timeout", " ", " ", ", ", "\n"
+    };
+    const size_t nbWords = sizeof(words) / sizeof(words[0]);
+    uint32_t state = 2463534242u;
+    Buffer data;
+    data.reserve(size);
+    while (data.size() < size) {
+        const uint32_t r = xorshift(state);
+        if ((r & 0x7) == 0) {
+            const std::string number = std::to_string(r % 100000);
+            data.insert(data.end(), number.begin(), number.end());
+        } else {
+            const char* word = words[(r >> 3) % nbWords];
+            data.insert(data.end(), word, word + std::strlen(word));
+        }
+    }
+    data.resize(size);
+    return data;
+}
+
+// Fixed-size little-endian records with slowly varying fields, like columnar or telemetry data
+Buffer generate_binary(size_t size)
+{
+    uint32_t state = 88172645u;
+    uint32_t id = 0;
+    uint32_t timestamp = 1500000000u;
+    Buffer data;
+    data.reserve(size + 16);
+    while (data.size() < size) {
+        const uint32_t r = xorshift(state);
+        const uint32_t fields[4] = {id++, timestamp += r % 16, r % 1024, 0xCAFE0000u | (r >> 24)};
+        for (uint32_t field : fields)
+            for (int i = 0; i < 4; ++i)
+                data.push_back(static_cast<unsigned char>(field >> (8 * i)));
+    }
+    data.resize(size);
+    return data;
+}
+
+Buffer generate_random(size_t size)
+{
+    uint32_t state = 1234567u;
+    Buffer data(size);
+    for (auto& byte : data)
+        byte = static_cast<unsigned char>(xorshift(state) >> 11);
+    return data;
+}
+
+Buffer read_file(const std::string& path)
+{
+    std::ifstream file(path, std::ios::binary);
+    check(file.good(), "cannot open " + path);
+    Buffer data((std::istreambuf_iterator<char>(file)), std::istreambuf_iterator<char>());
+    // the ratio and throughput are per input byte
+    check(!data.empty(), path + " is empty");
+    return data;
+}
+
+// Best wall time over repeated runs, repeating until at least min_seconds elapsed
+double time_best(const std::function<void()>& fn, double min_seconds)
+{
+    typedef std::chrono::steady_clock clock;
+    double best = 0.0;
+    double total = 0.0;
+    do {
+        const auto start = clock::now();
+        fn();
+        const double elapsed = std::chrono::duration<double>(clock::now() - start).count();
+        best = (total == 0.0 || elapsed < best) ? elapsed : best;
+        total += elapsed;
+    } while (total < min_seconds);
+    return std::max(best, 1e-9);
+}
+
+// Quoted CSV field, with embedded quotes doubled; corpus names are file paths, which may contain commas
+std::string csv_field(const std::string& value)
+{
+    std::string quoted = "\"";
+    for (const char c : value) {
+        if (c == '"')
+            quoted += '"';
+        quoted += c;
+    }
+    return quoted + '"';
+}
+
+void write_csv(const std::string& path, const std::vector<Result>& results)
+{
+    std::ofstream out(path);
+    out << "corpus,library,level,original_bytes,compressed_bytes,ratio,compress_mb_s,decompress_mb_s\n";
+    for (const auto& r : results) {
+        out << csv_field(r.corpus) << ',' << r.library << ',' << r.level << ',' << r.original << ',' << r.compressed << ','
+            << static_cast<double>(r.original) / r.compressed << ',' << r.compress_mb_s << ',' << r.decompress_mb_s << '\n';
+    }
+}
+
+// Quoted JSON string; corpus names are file paths, which may contain quotes or backslashes
+std::string json_string(const std::string& value)
+{
+    std::string quoted = "\"";
+    for (const char c : value) {
+        if (c == '"' || c == '\\') {
+            quoted += '\\';
+            quoted += c;
+        } else if (static_cast<unsigned char>(c) < 0x20) {
+            char escaped[8];
+            std::snprintf(escaped, sizeof(escaped), "\\u%04x", static_cast<unsigned char>(c));
+            quoted += escaped;
+        } else {
+            quoted += c;
+        }
+    }
+    return quoted + '"';
+}
+
+void write_json(const std::string& path, const std::vector<Result>& results)
+{
+    std::ofstream out(path);
+    out << "{\n  \"results\": [";
+    for (size_t i = 0; i < results.size(); ++i) {
+        const auto& r = results[i];
+        out << (i ? "," : "") << "\n    {\"corpus\": " << json_string(r.corpus) << ", \"library\": " << json_string(r.library)
+            << ", \"level\": " << json_string(r.level) << ", \"original_bytes\": " << r.original
+            << ", \"compressed_bytes\": " << r.compressed
+            << ", \"ratio\": " << static_cast<double>(r.original) / r.compressed
+            << ", \"compress_mb_s\": " << r.compress_mb_s << ", \"decompress_mb_s\": " << r.decompress_mb_s << "}";
+    }
+    out << "\n  ]\n}\n";
+}
+
+void usage()
+{
+    std::cerr << "usage: compression_benchmark [--size-mb N] [--min-time SECONDS] [--file PATH]... "
+                 "[--csv PATH] [--json PATH]\n";
+}
+
+} // namespace
+
+int main(int argc, char** argv)
+{
+    size_t sizeMB = 32;
+    double minSeconds = 0.5;
+    std::string csvPath = "compression_benchmark.csv";
+    std::string jsonPath = "compression_benchmark.json";
+    std::vector<std::string> files;
+
+    for (int i = 1; i < argc; ++i) {
+        const std::string arg = argv[i];
+        if (i + 1 >= argc) {
+            usage();
+            return 1;
+        }
+        if (arg == "--size-mb")
+            sizeMB = std::strtoul(argv[++i], nullptr, 10);
+        else if (arg == "--min-time")
+            minSeconds = std::strtod(argv[++i], nullptr);
+        else if (arg == "--file")
+            files.push_back(argv[++i]);
+        else if (arg == "--csv")
+            csvPath = argv[++i];
+        else if (arg == "--json")
+            jsonPath = argv[++i];
+        else {
+            usage();
+            return 1;
+        }
+    }
+
+    if (sizeMB == 0) {
+        usage();
+        return 1;
+    }
+
+    if (lzo_init() != LZO_E_OK) {
+        std::cerr << "lzo_init() failed\n";
+        return 1;
+    }
+
+    const size_t size = sizeMB * 1024 * 1024;
+    std::vector<Result> results;
+    try {
+        std::vector<Corpus> corpora = {
+            {"text", generate_text(size)},
+            {"binary", generate_binary(size)},
+            {"random", generate_random(size)},
+        };
+        for (const auto& path : files)
+            corpora.push_back({path, read_file(path)});
+
+        const std::vector<Codec> codecs = make_codecs();
+        for (const auto& corpus : corpora) {
+            const double mb = static_cast<double>(corpus.data.size()) / (1024.0 * 1024.0);
+            for (const auto& codec : codecs) {
+                Buffer compressed;
+                Buffer decompressed(corpus.data.size());
+                size_t compressedSize = 0;
+                const double cSeconds = time_best([&] { compressedSize = codec.compress(corpus.data, compressed); }, minSeconds);
+                const double dSeconds = time_best([&] { codec.decompress(compressed.data(), compressedSize, decompressed); }, minSeconds);
+                check(decompressed == corpus.data, codec.library + " round trip");
+
+                const Result result = {corpus.name, codec.library, codec.level, corpus.data.size(), compressedSize,
+                                       mb / cSeconds, mb / dSeconds};
+                std::printf("%-8s %-7s %-7s ratio %7.3f  compress %9.1f MB/s  decompress %9.1f MB/s\n",
+                            result.corpus.c_str(), result.library.c_str(), result.level.c_str(),
+                            static_cast<double>(result.original) / result.compressed,
+                            result.compress_mb_s, result.decompress_mb_s);
+                results.push_back(result);
+            }
+        }
+    } catch (const std::exception& e) {
+        std::cerr << "error: " << e.what() << '\n';
+        return 1;
+    }
+
+    write_csv(csvPath, results);
+    write_json(jsonPath, results);
+    std::cout << "results written to " << csvPath << " and " << jsonPath << '\n';
+    return 0;
+}
@@ -0,0 +1,26 @@
+import os
+from conans import ConanFile, CMake, tools
+
+
+class CompressionBenchmarkConan(ConanFile):
+    settings = "os", "compiler", "build_type", "arch"
+    requires = ("zlib/1.2.11",
+                "bzip2/1.0.8",
+                "xz_utils/5.2.4",
+                "lz4/1.9.2",
+                "zstd/1.4.3",
+                "brotli/1.0.7",
+                "snappy/1.1.7",
+                "lzo/2.10")
+    generators = "cmake"
+    exports_sources = ["CMakeLists.txt", "compression_benchmark.cpp"]
+
+    def build(self):
+        cmake = CMake(self)
+        cmake.configure()
+        cmake.build()
+        if not tools.cross_building(self.settings):
+            size_mb = tools.get_env("CONAN_COMPRESSION_BENCHMARK_MB", 32)
+            command = "%s --size-mb %s --csv compression_benchmark.csv --json compression_benchmark.json" % \
+                      (os.path.join("bin", "compression_benchmark"), size_mb)
+            self.run(command, run_environment=True)
@@ -0,0 +1,83 @@
+/* Timing and JSON reporting shared by the C benchmark programs */
+
+#ifndef TLS_BENCHMARK_COMMON_H
+#define TLS_BENCHMARK_COMMON_H
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+
+#define BENCH_RECORD_SIZE 16384          /* bulk ciphers work on full TLS records */
+#define BENCH_HASH_SIZE (1024 * 1024)
+
+typedef void (*bench_fn)(void* arg);
+
+typedef struct {
+    FILE* out;
+    int first;
+} bench_report;
+
+static double bench_now(void)
+{
+    struct timespec ts;
+    timespec_get(&ts, TIME_UTC);
+    return (double)ts.tv_sec + (double)ts.tv_nsec / 1e9;
+}
+
+/* Runs fn repeatedly for at least `seconds`, returns calls per second */
+static double bench_rate(bench_fn fn, void* arg, double seconds)
+{
+    double const start = bench_now();
+    double elapsed = 0.0;
+    unsigned long calls = 0;
+    do {
+        fn(arg);
+        ++calls;
+        elapsed = bench_now() - start;
+    } while (elapsed < seconds);
+    return (double)calls / elapsed;
+}
+
+static void bench_parse_args(int argc, char** argv, double* seconds, const char** json)
+{
+    int i;
+    for (i = 1; i + 1 < argc; i += 2) {
+        if (strcmp(argv[i], "--seconds") == 0)
+            *seconds = strtod(argv[i + 1], NULL);
+        else if (strcmp(argv[i], "--json") == 0)
+            *json = argv[i + 1];
+    }
+}
+
+static void bench_report_open(bench_report* report, const char* path, const char* library, const char* version)
+{
+    report->out = fopen(path, "w");
+    if (report->out == NULL) {
+        perror(path);
+        exit(1);
+    }
+    report->first = 1;
+    fprintf(report->out, "{\n  \"library\": \"%s\",\n  \"version\": \"%s\",\n  \"results\": [", library, version);
+}
+
+static void bench_report_add(bench_report* report, const char* workload, const char* unit, double value)
+{
+    printf("%-28s %12.3f %s\n", workload, value, unit);
+    fprintf(report->out, "%s\n    {\"workload\": \"%s\", \"unit\": \"%s\", \"value\": %.3f}",
+            report->first ? "" : ",", workload, unit, value);
+    report->first = 0;
+}
+
+static void bench_report_skip(const char* workload, const char* reason)
+{
+    printf("%-28s skipped (%s)\n", workload, reason);
+}
+
+static void bench_report_close(bench_report* report)
+{
+    fprintf(report->out, "\n  ]\n}\n");
+    fclose(report->out);
+}
+
+#endif
@@ -0,0 +1,31 @@
+import os
+from conans import ConanFile, CMake, tools
+
+
+class TlsBenchmarkConan(ConanFile):
+    settings = "os", "compiler", "build_type", "arch"
+    options = {"backend": ["openssl", "libressl", "mbedtls", "botan"]}
+    default_options = {"backend": "openssl"}
+    generators = "cmake"
+    exports_sources = ["CMakeLists.txt", "bench_common.h", "tls_benchmark_*.c*"]
+
+    _backend_requirements = {
+        "openssl": "openssl/1.1.1d",
+        "libressl": "libressl/3.0.2",
+        "mbedtls": "mbedtls/2.16.3-apache",
+        "botan": "botan/2.13.0",
+    }
+
+    def requirements(self):
+        self.requires(self._backend_requirements[str(self.options.backend)])
+
+    def build(self):
+        cmake = CMake(self)
+        cmake.definitions["TLS_BACKEND"] = self.options.backend
+        cmake.configure()
+        cmake.build()
+        if not tools.cross_building(self.settings):
+            seconds = tools.get_env("CONAN_TLS_BENCHMARK_SECONDS", 2)
+            command = "%s --seconds %s --json tls_benchmark_%s.json" % \
+                      (os.path.join("bin", "tls_benchmark"), seconds, self.options.backend)
+            self.run(command, run_environment=True)
@@ -0,0 +1,232 @@
+// TLS handshake and bulk crypto benchmark for Botan 2.
+//
+// Client and server run in the same process; each side's emitted records are
+// fed straight into the peer, so no network is involved. Every handshake is a
+// full one (Session_Manager_Noop, no tickets).
+
+#include <botan/aead.h>
+#include <botan/auto_rng.h>
+#include <botan/ecdsa.h>
+#include <botan/hash.h>
+#include <botan/rsa.h>
+#include <botan/tls_client.h>
+#include <botan/tls_policy.h>
+#include <botan/tls_server.h>
+#include <botan/tls_session_manager.h>
+#include <botan/version.h>
+#include <botan/x509self.h>
+
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <functional>
+#include <memory>
+#include <sstream>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+namespace {
+
+const size_t kRecordSize = 16384;
+const size_t kHashSize = 1024 * 1024;
+
+double bench_rate(const std::function<void()>& fn, double seconds) {
+    typedef std::chrono::steady_clock clock;
+    const clock::time_point start = clock::now();
+    double elapsed = 0.0;
+    unsigned long calls = 0;
+    do {
+        fn();
+        ++calls;
+        elapsed = std::chrono::duration<double>(clock::now() - start).count();
+    } while (elapsed < seconds);
+    return calls / elapsed;
+}
+
+class Report {
+public:
+    Report(const std::string& path, const std::string& version)
+        : out_(std::fopen(path.c_str(), "w")), first_(true) {
+        if (out_ == nullptr) {
+            std::perror(path.c_str());
+            std::exit(1);
+        }
+        std::fprintf(out_, "{\n  \"library\": \"botan\",\n  \"version\": \"%s\",\n  \"results\": [", version.c_str());
+    }
+
+    ~Report() {
+        std::fprintf(out_, "\n  ]\n}\n");
+        std::fclose(out_);
+    }
+
+    void add(const std::string& workload, const std::string& unit, double value) {
+        std::printf("%-28s %12.3f %s\n", workload.c_str(), value, unit.c_str());
+        std::fprintf(out_, "%s\n    {\"workload\": \"%s\", \"unit\": \"%s\", \"value\": %.3f}",
+                     first_ ? "" : ",", workload.c_str(), unit.c_str(), value);
+        first_ = false;
+    }
+
+    static void skip(const std::string& workload, const std::string& reason) {
+        std::printf("%-28s skipped (%s)\n", workload.c_str(), reason.c_str());
+    }
+
+private:
+    std::FILE* out_;
+    bool first_;
+};
+
+class Credentials : public Botan::Credentials_Manager {
+public:
+    Credentials(Botan::Private_Key& key, const Botan::X509_Certificate& cert) : key_(key), cert_(cert) {}
+
+    std::vector<Botan::X509_Certificate> cert_chain(const std::vector<std::string>& cert_key_types,
+                                                    const std::string& type,
+                                                    const std::string&) override {
+        if (type != "tls-server")
+            return {};
+        for (const auto& key_type : cert_key_types) {
+            if (key_type == key_.algo_name())
+                return {cert_};
+        }
+        return {};
+    }
+
+    Botan::Private_Key* private_key_for(const Botan::X509_Certificate&, const std::string&,
+                                        const std::string&) override {
+        return &key_;
+    }
+
+private:
+    Botan::Private_Key& key_;
+    Botan::X509_Certificate cert_;
+};
+
+class Callbacks : public Botan::TLS::Callbacks {
+public:
+    std::function<void(const uint8_t*, size_t)> emit;
+    bool done = false;
+
+    void tls_emit_data(const uint8_t data[], size_t size) override { emit(data, size); }
+    void tls_record_received(uint64_t, const uint8_t[], size_t) override {}
+    void tls_alert(Botan::TLS::Alert alert) override {
+        if (alert.is_fatal())
+            throw std::runtime_error("TLS alert: " + alert.type_string());
+    }
+    bool tls_session_established(const Botan::TLS::Session&) override {
+        done = true;
+        return false;
+    }
+    void tls_verify_cert_chain(const std::vector<Botan::X509_Certificate>&,
+                               const std::vector<std::shared_ptr<const Botan::OCSP::Response>>&,
+                               const std::vector<Botan::Certificate_Store*>&, Botan::Usage_Type,
+                               const std::string&, const Botan::TLS::Policy&) override {
+        // self-signed benchmark certificate
+    }
+};
+
+void handshake_once(Botan::RandomNumberGenerator& rng, Credentials& creds, const Botan::TLS::Policy& policy) {
+    Botan::TLS::Session_Manager_Noop sessions;
+    Callbacks server_callbacks;
+    Callbacks client_callbacks;
+    std::vector<uint8_t> to_server;
+    std::vector<uint8_t> to_client;
+    server_callbacks.emit = [&to_client](const uint8_t* data, size_t size) {
+        to_client.insert(to_client.end(), data, data + size);
+    };
+    client_callbacks.emit = [&to_server](const uint8_t* data, size_t size) {
+        to_server.insert(to_server.end(), data, data + size);
+    };
+
+    Botan::TLS::Server server(server_callbacks, sessions, creds, policy, rng);
+    Botan::TLS::Client client(client_callbacks, sessions, creds, policy, rng,
+                              Botan::TLS::Server_Information("localhost"));
+
+    for (int rounds = 0; !server_callbacks.done || !client_callbacks.done; ++rounds) {
+        if (rounds > 100)
+            throw std::runtime_error("handshake did not complete");
+        std::vector<uint8_t> pending;
+        pending.swap(to_server);
+        if (!pending.empty())
+            server.received_data(pending.data(), pending.size());
+        pending.clear();
+        pending.swap(to_client);
+        if (!pending.empty())
+            client.received_data(pending.data(), pending.size());
+    }
+}
+
+void bench_handshake(Report& report, const std::string& workload, Botan::RandomNumberGenerator& rng,
+                     Botan::Private_Key& key, const std::string& groups, double seconds) {
+    Botan::X509_Cert_Options options("localhost");
+    const Botan::X509_Certificate cert = Botan::X509::create_self_signed_cert(options, key, "SHA-256", rng);
+    Credentials creds(key, cert);
+    std::istringstream policy_text("key_exchange_groups = " + groups + "\n"
+                                   "signature_methods = " + key.algo_name() + "\n");
+    const Botan::TLS::Text_Policy policy(policy_text);
+    try {
+        handshake_once(rng, creds, policy);
+    } catch (const std::exception& e) {
+        Report::skip(workload, e.what());
+        return;
+    }
+    report.add(workload, "handshakes/s", bench_rate([&]() { handshake_once(rng, creds, policy); }, seconds));
+}
+
+void bench_aead(Report& report, const std::string& workload, const std::string& algo, double seconds) {
+    std::unique_ptr<Botan::AEAD_Mode> mode = Botan::AEAD_Mode::create(algo, Botan::ENCRYPTION);
+    if (!mode) {
+        Report::skip(workload, algo + " not available");
+        return;
+    }
+    const std::vector<uint8_t> key(32, 0x42);
+    std::vector<uint8_t> nonce(12, 0);
+    Botan::secure_vector<uint8_t> record;
+    mode->set_key(key);
+    report.add(workload, "GB/s", bench_rate([&]() {
+        record.assign(kRecordSize, 0);
+        mode->start(nonce);
+        mode->finish(record);
+        ++nonce[11];
+    }, seconds) * kRecordSize / 1e9);
+}
+
+void bench_sha256(Report& report, double seconds) {
+    std::unique_ptr<Botan::HashFunction> hash = Botan::HashFunction::create_or_throw("SHA-256");
+    const std::vector<uint8_t> input(kHashSize, 0);
+    uint8_t digest[32];
+    report.add("sha256", "GB/s", bench_rate([&]() {
+        hash->update(input);
+        hash->final(digest);
+    }, seconds) * kHashSize / 1e9);
+}
+
+}  // namespace
+
+int main(int argc, char** argv) {
+    double seconds = 2.0;
+    std::string json = "tls_benchmark_botan.json";
+    for (int i = 1; i + 1 < argc; i += 2) {
+        if (std::strcmp(argv[i], "--seconds") == 0)
+            seconds = std::strtod(argv[i + 1], nullptr);
+        else if (std::strcmp(argv[i], "--json") == 0)
+            json = argv[i + 1];
+    }
+
+    Botan::AutoSeeded_RNG rng;
+    {
+        Report report(json, Botan::short_version_string());
+        Botan::RSA_PrivateKey rsa(rng, 2048);
+        Botan::ECDSA_PrivateKey p256(rng, Botan::EC_Group("secp256r1"));
+        bench_handshake(report, "handshake_rsa2048", rng, rsa, "secp256r1", seconds);
+        bench_handshake(report, "handshake_ecdsa_p256", rng, p256, "secp256r1", seconds);
+        bench_handshake(report, "handshake_x25519", rng, p256, "x25519 secp256r1", seconds);
+
+        bench_aead(report, "aes_256_gcm", "AES-256/GCM", seconds);
+        bench_aead(report, "chacha20_poly1305", "ChaCha20Poly1305", seconds);
+        bench_sha256(report, seconds);
+    }
+    std::printf("results written to %s\n", json.c_str());
+    return 0;
+}
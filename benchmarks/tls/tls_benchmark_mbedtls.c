@@ -0,0 +1,339 @@
+/*
+ * TLS handshake and bulk crypto benchmark for mbed TLS.
+ *
+ * Client and server run in the same process and exchange records through two
+ * in-memory pipes, so no network is involved. Every handshake is a full one
+ * (no session tickets, no session cache).
+ */
+
+#include <mbedtls/ctr_drbg.h>
+#include <mbedtls/ecp.h>
+#include <mbedtls/entropy.h>
+#include <mbedtls/gcm.h>
+#include <mbedtls/pk.h>
+#include <mbedtls/rsa.h>
+#include <mbedtls/sha256.h>
+#include <mbedtls/ssl.h>
+#include <mbedtls/version.h>
+#include <mbedtls/x509_crt.h>
+#include <mbedtls/x509_csr.h>
+#if defined(MBEDTLS_CHACHAPOLY_C)
+#include <mbedtls/chachapoly.h>
+#endif
+
+#include "bench_common.h"
+
+#define PIPE_SIZE (64 * 1024)
+
+typedef struct {
+    unsigned char data[PIPE_SIZE];
+    size_t len;
+} pipe_buffer;
+
+typedef struct {
+    pipe_buffer* in;
+    pipe_buffer* out;
+} pipe_end;
+
+typedef struct {
+    mbedtls_ssl_config server;
+    mbedtls_ssl_config client;
+    mbedtls_x509_crt cert;
+    mbedtls_ecp_group_id curves[3];
+    int failed;
+} handshake_ctx;
+
+typedef struct {
+    mbedtls_gcm_context ctx;
+    unsigned char iv[12];
+    unsigned char in[BENCH_RECORD_SIZE];
+    unsigned char out[BENCH_RECORD_SIZE];
+} gcm_ctx;
+
+static mbedtls_entropy_context entropy;
+static mbedtls_ctr_drbg_context ctr_drbg;
+
+static void die(const char* what, int ret)
+{
+    fprintf(stderr, "%s failed: -0x%04x\n", what, (unsigned int)-ret);
+    exit(1);
+}
+
+static int pipe_send(void* ctx, const unsigned char* buf, size_t len)
+{
+    pipe_buffer* const out = ((pipe_end*)ctx)->out;
+    if (len > PIPE_SIZE - out->len)
+        len = PIPE_SIZE - out->len;
+    if (len == 0)
+        return MBEDTLS_ERR_SSL_WANT_WRITE;
+    memcpy(out->data + out->len, buf, len);
+    out->len += len;
+    return (int)len;
+}
+
+static int pipe_recv(void* ctx, unsigned char* buf, size_t len)
+{
+    pipe_buffer* const in = ((pipe_end*)ctx)->in;
+    if (in->len == 0)
+        return MBEDTLS_ERR_SSL_WANT_READ;
+    if (len > in->len)
+        len = in->len;
+    memcpy(buf, in->data, len);
+    memmove(in->data, in->data + len, in->len - len);
+    in->len -= len;
+    return (int)len;
+}
+
+static void make_key(mbedtls_pk_context* key, int rsa)
+{
+    int ret;
+    mbedtls_pk_init(key);
+    if (rsa) {
+        if ((ret = mbedtls_pk_setup(key, mbedtls_pk_info_from_type(MBEDTLS_PK_RSA))) != 0 ||
+            (ret = mbedtls_rsa_gen_key(mbedtls_pk_rsa(*key), mbedtls_ctr_drbg_random, &ctr_drbg, 2048, 65537)) != 0)
+            die("RSA-2048 key generation", ret);
+    } else {
+        if ((ret = mbedtls_pk_setup(key, mbedtls_pk_info_from_type(MBEDTLS_PK_ECKEY))) != 0 ||
+            (ret = mbedtls_ecp_gen_key(MBEDTLS_ECP_DP_SECP256R1, mbedtls_pk_ec(*key),
+                                       mbedtls_ctr_drbg_random, &ctr_drbg)) != 0)
+            die("P-256 key generation", ret);
+    }
+}
+
+static void make_self_signed_cert(mbedtls_x509_crt* crt, mbedtls_pk_context* key)
+{
+    mbedtls_x509write_cert writer;
+    mbedtls_mpi serial;
+    unsigned char der[4096];
+    int ret;
+
+    mbedtls_x509write_crt_init(&writer);
+    mbedtls_mpi_init(&serial);
+    mbedtls_mpi_lset(&serial, 1);
+    mbedtls_x509write_crt_set_version(&writer, MBEDTLS_X509_CRT_VERSION_3);
+    mbedtls_x509write_crt_set_md_alg(&writer, MBEDTLS_MD_SHA256);
+    mbedtls_x509write_crt_set_subject_key(&writer, key);
+    mbedtls_x509write_crt_set_issuer_key(&writer, key);
+    mbedtls_x509write_crt_set_serial(&writer, &serial);
+    if ((ret = mbedtls_x509write_crt_set_subject_name(&writer, "CN=localhost")) != 0 ||
+        (ret = mbedtls_x509write_crt_set_issuer_name(&writer, "CN=localhost")) != 0 ||
+        (ret = mbedtls_x509write_crt_set_validity(&writer, "20200101000000", "20991231235959")) != 0)
+        die("certificate setup", ret);
+    /* mbedtls_x509write_crt_der writes at the end of the buffer */
+    ret = mbedtls_x509write_crt_der(&writer, der, sizeof(der), mbedtls_ctr_drbg_random, &ctr_drbg);
+    if (ret < 0)
+        die("mbedtls_x509write_crt_der", ret);
+    mbedtls_x509_crt_init(crt);
+    if ((ret = mbedtls_x509_crt_parse_der(crt, der + sizeof(der) - ret, (size_t)ret)) != 0)
+        die("mbedtls_x509_crt_parse_der", ret);
+    mbedtls_x509write_crt_free(&writer);
+    mbedtls_mpi_free(&serial);
+}
+
+static void make_conf(mbedtls_ssl_config* conf, int endpoint, const mbedtls_ecp_group_id* curves)
+{
+    int ret;
+    mbedtls_ssl_config_init(conf);
+    if ((ret = mbedtls_ssl_config_defaults(conf, endpoint, MBEDTLS_SSL_TRANSPORT_STREAM,
+                                           MBEDTLS_SSL_PRESET_DEFAULT)) != 0)
+        die("mbedtls_ssl_config_defaults", ret);
+    mbedtls_ssl_conf_rng(conf, mbedtls_ctr_drbg_random, &ctr_drbg);
+    mbedtls_ssl_conf_authmode(conf, MBEDTLS_SSL_VERIFY_NONE);
+    mbedtls_ssl_conf_curves(conf, curves);
+#if defined(MBEDTLS_SSL_SESSION_TICKETS)
+    mbedtls_ssl_conf_session_tickets(conf, MBEDTLS_SSL_SESSION_TICKETS_DISABLED);
+#endif
+}
+
+static void handshake_once(void* arg)
+{
+    handshake_ctx* const hs = (handshake_ctx*)arg;
+    static pipe_buffer to_server, to_client;
+    pipe_end server_end = { &to_server, &to_client };
+    pipe_end client_end = { &to_client, &to_server };
+    mbedtls_ssl_context server, client;
+    int server_done = 0;
+    int client_done = 0;
+    int rounds = 0;
+    int ret;
+
+    to_server.len = to_client.len = 0;
+    mbedtls_ssl_init(&server);
+    mbedtls_ssl_init(&client);
+    if ((ret = mbedtls_ssl_setup(&server, &hs->server)) != 0 || (ret = mbedtls_ssl_setup(&client, &hs->client)) != 0)
+        die("mbedtls_ssl_setup", ret);
+    mbedtls_ssl_set_bio(&server, &server_end, pipe_send, pipe_recv, NULL);
+    mbedtls_ssl_set_bio(&client, &client_end, pipe_send, pipe_recv, NULL);
+
+    while (!hs->failed && (!server_done || !client_done)) {
+        if (!client_done) {
+            ret = mbedtls_ssl_handshake(&client);
+            if (ret == 0)
+                client_done = 1;
+            else if (ret != MBEDTLS_ERR_SSL_WANT_READ && ret != MBEDTLS_ERR_SSL_WANT_WRITE)
+                hs->failed = ret;
+        }
+        if (!server_done && !hs->failed) {
+            ret = mbedtls_ssl_handshake(&server);
+            if (ret == 0)
+                server_done = 1;
+            else if (ret != MBEDTLS_ERR_SSL_WANT_READ && ret != MBEDTLS_ERR_SSL_WANT_WRITE)
+                hs->failed = ret;
+        }
+        if (++rounds > 100)
+            die("handshake completion", 0);
+    }
+    mbedtls_ssl_free(&server);
+    mbedtls_ssl_free(&client);
+}
+
+static void bench_handshake(bench_report* report, const char* workload, int rsa, mbedtls_ecp_group_id curve,
+                            double seconds)
+{
+    handshake_ctx* const hs = (handshake_ctx*)calloc(1, sizeof(handshake_ctx));
+    mbedtls_pk_context key;
+    int ret;
+    double rate;
+
+    if (hs == NULL)
+        die("allocation", 0);
+    /* The certificate curve has to stay in the list for the ECDSA signature */
+    hs->curves[0] = curve;
+    hs->curves[1] = curve == MBEDTLS_ECP_DP_SECP256R1 ? MBEDTLS_ECP_DP_NONE : MBEDTLS_ECP_DP_SECP256R1;
+    hs->curves[2] = MBEDTLS_ECP_DP_NONE;
+    make_key(&key, rsa);
+    make_self_signed_cert(&hs->cert, &key);
+    make_conf(&hs->server, MBEDTLS_SSL_IS_SERVER, hs->curves);
+    make_conf(&hs->client, MBEDTLS_SSL_IS_CLIENT, hs->curves);
+    if ((ret = mbedtls_ssl_conf_own_cert(&hs->server, &hs->cert, &key)) != 0)
+        die("mbedtls_ssl_conf_own_cert", ret);
+
+    /* A group the build does not enable fails the first handshake */
+    handshake_once(hs);
+    if (hs->failed) {
+        bench_report_skip(workload, "key exchange group not supported");
+    } else {
+        rate = bench_rate(handshake_once, hs, seconds);
+        if (hs->failed)
+            die("handshake", hs->failed);
+        bench_report_add(report, workload, "handshakes/s", rate);
+    }
+
+    mbedtls_ssl_config_free(&hs->server);
+    mbedtls_ssl_config_free(&hs->client);
+    mbedtls_x509_crt_free(&hs->cert);
+    mbedtls_pk_free(&key);
+    free(hs);
+}
+
+static void gcm_seal_record(void* arg)
+{
+    gcm_ctx* const g = (gcm_ctx*)arg;
+    unsigned char tag[16];
+    int const ret = mbedtls_gcm_crypt_and_tag(&g->ctx, MBEDTLS_GCM_ENCRYPT, sizeof(g->in), g->iv, sizeof(g->iv),
+                                              NULL, 0, g->in, g->out, sizeof(tag), tag);
+    if (ret != 0)
+        die("mbedtls_gcm_crypt_and_tag", ret);
+    ++g->iv[11];
+}
+
+static void bench_aes_gcm(bench_report* report, double seconds)
+{
+    unsigned char key[32];
+    gcm_ctx* const g = (gcm_ctx*)calloc(1, sizeof(gcm_ctx));
+    int ret;
+    if (g == NULL)
+        die("allocation", 0);
+    memset(key, 0x42, sizeof(key));
+    mbedtls_gcm_init(&g->ctx);
+    if ((ret = mbedtls_gcm_setkey(&g->ctx, MBEDTLS_CIPHER_ID_AES, key, 256)) != 0)
+        die("mbedtls_gcm_setkey", ret);
+    bench_report_add(report, "aes_256_gcm", "GB/s", bench_rate(gcm_seal_record, g, seconds) * sizeof(g->in) / 1e9);
+    mbedtls_gcm_free(&g->ctx);
+    free(g);
+}
+
+#if defined(MBEDTLS_CHACHAPOLY_C)
+typedef struct {
+    mbedtls_chachapoly_context ctx;
+    unsigned char nonce[12];
+    unsigned char in[BENCH_RECORD_SIZE];
+    unsigned char out[BENCH_RECORD_SIZE];
+} chachapoly_ctx;
+
+static void chachapoly_seal_record(void* arg)
+{
+    chachapoly_ctx* const c = (chachapoly_ctx*)arg;
+    unsigned char tag[16];
+    int const ret = mbedtls_chachapoly_encrypt_and_tag(&c->ctx, sizeof(c->in), c->nonce, NULL, 0, c->in, c->out, tag);
+    if (ret != 0)
+        die("mbedtls_chachapoly_encrypt_and_tag", ret);
+    ++c->nonce[11];
+}
+
+static void bench_chacha20_poly1305(bench_report* report, double seconds)
+{
+    unsigned char key[32];
+    chachapoly_ctx* const c = (chachapoly_ctx*)calloc(1, sizeof(chachapoly_ctx));
+    int ret;
+    if (c == NULL)
+        die("allocation", 0);
+    memset(key, 0x42, sizeof(key));
+    mbedtls_chachapoly_init(&c->ctx);
+    if ((ret = mbedtls_chachapoly_setkey(&c->ctx, key)) != 0)
+        die("mbedtls_chachapoly_setkey", ret);
+    bench_report_add(report, "chacha20_poly1305", "GB/s",
+                     bench_rate(chachapoly_seal_record, c, seconds) * sizeof(c->in) / 1e9);
+    mbedtls_chachapoly_free(&c->ctx);
+    free(c);
+}
+#endif
+
+static void sha256_buffer(void* arg)
+{
+    unsigned char digest[32];
+    int const ret = mbedtls_sha256_ret(arg, BENCH_HASH_SIZE, digest, 0);
+    if (ret != 0)
+        die("mbedtls_sha256_ret", ret);
+}
+
+int main(int argc, char** argv)
+{
+    double seconds = 2.0;
+    const char* json = "tls_benchmark_mbedtls.json";
+    const char* const personalization = "tls_benchmark";
+    bench_report report;
+    unsigned char* hash_input;
+    int ret;
+
+    bench_parse_args(argc, argv, &seconds, &json);
+    mbedtls_entropy_init(&entropy);
+    mbedtls_ctr_drbg_init(&ctr_drbg);
+    if ((ret = mbedtls_ctr_drbg_seed(&ctr_drbg, mbedtls_entropy_func, &entropy,
+                                     (const unsigned char*)personalization, strlen(personalization))) != 0)
+        die("mbedtls_ctr_drbg_seed", ret);
+    bench_report_open(&report, json, "mbedtls", MBEDTLS_VERSION_STRING_FULL);
+
+    bench_handshake(&report, "handshake_rsa2048", 1, MBEDTLS_ECP_DP_SECP256R1, seconds);
+    bench_handshake(&report, "handshake_ecdsa_p256", 0, MBEDTLS_ECP_DP_SECP256R1, seconds);
+    bench_handshake(&report, "handshake_x25519", 0, MBEDTLS_ECP_DP_CURVE25519, seconds);
+
+    bench_aes_gcm(&report, seconds);
+#if defined(MBEDTLS_CHACHAPOLY_C)
+    bench_chacha20_poly1305(&report, seconds);
+#else
+    bench_report_skip("chacha20_poly1305", "MBEDTLS_CHACHAPOLY_C is disabled");
+#endif
+
+    hash_input = (unsigned char*)calloc(1, BENCH_HASH_SIZE);
+    if (hash_input == NULL)
+        die("allocation", 0);
+    bench_report_add(&report, "sha256", "GB/s", bench_rate(sha256_buffer, hash_input, seconds) * BENCH_HASH_SIZE / 1e9);
+    free(hash_input);
+
+    bench_report_close(&report);
+    mbedtls_ctr_drbg_free(&ctr_drbg);
+    mbedtls_entropy_free(&entropy);
+    printf("results written to %s\n", json);
+    return 0;
+}
@@ -0,0 +1,287 @@
+/*
+ * TLS handshake and bulk crypto benchmark for OpenSSL and LibreSSL.
+ *
+ * Client and server run in the same process and talk through a BIO pair, so
+ * no network is involved. Every handshake is a full one (no session reuse).
+ */
+
+#include <openssl/bio.h>
+#include <openssl/bn.h>
+#include <openssl/ec.h>
+#include <openssl/err.h>
+#include <openssl/evp.h>
+#include <openssl/objects.h>
+#include <openssl/opensslv.h>
+#include <openssl/rsa.h>
+#include <openssl/ssl.h>
+#include <openssl/x509.h>
+
+#include "bench_common.h"
+
+#if defined(LIBRESSL_VERSION_NUMBER)
+#define BENCH_LIBRARY "libressl"
+#else
+#define BENCH_LIBRARY "openssl"
+#endif
+
+#if OPENSSL_VERSION_NUMBER < 0x10100000L || defined(LIBRESSL_VERSION_NUMBER)
+#define BENCH_HAS_EVP_CHACHA20_POLY1305 0
+#else
+#define BENCH_HAS_EVP_CHACHA20_POLY1305 1
+#endif
+
+typedef struct {
+    SSL_CTX* server;
+    SSL_CTX* client;
+} handshake_ctx;
+
+typedef struct {
+    const EVP_CIPHER* cipher;
+    EVP_CIPHER_CTX* ctx;
+    unsigned char key[32];
+    unsigned char iv[12];
+    unsigned char in[BENCH_RECORD_SIZE];
+    unsigned char out[BENCH_RECORD_SIZE];
+} aead_ctx;
+
+static void die(const char* what)
+{
+    fprintf(stderr, "%s failed\n", what);
+    ERR_print_errors_fp(stderr);
+    exit(1);
+}
+
+static EVP_PKEY* make_rsa_key(void)
+{
+    EVP_PKEY* pkey = EVP_PKEY_new();
+    RSA* rsa = RSA_new();
+    BIGNUM* e = BN_new();
+    if (pkey == NULL || rsa == NULL || e == NULL || !BN_set_word(e, RSA_F4) ||
+        !RSA_generate_key_ex(rsa, 2048, e, NULL) || !EVP_PKEY_assign_RSA(pkey, rsa))
+        die("RSA-2048 key generation");
+    BN_free(e);
+    return pkey;
+}
+
+static EVP_PKEY* make_p256_key(void)
+{
+    EVP_PKEY* pkey = EVP_PKEY_new();
+    EC_KEY* ec = EC_KEY_new_by_curve_name(NID_X9_62_prime256v1);
+    if (pkey == NULL || ec == NULL)
+        die("P-256 key allocation");
+    EC_KEY_set_asn1_flag(ec, OPENSSL_EC_NAMED_CURVE);
+    if (!EC_KEY_generate_key(ec) || !EVP_PKEY_assign_EC_KEY(pkey, ec))
+        die("P-256 key generation");
+    return pkey;
+}
+
+static X509* make_self_signed_cert(EVP_PKEY* pkey)
+{
+    X509* x509 = X509_new();
+    X509_NAME* name;
+    if (x509 == NULL)
+        die("X509_new");
+    X509_set_version(x509, 2);
+    ASN1_INTEGER_set(X509_get_serialNumber(x509), 1);
+    X509_gmtime_adj(X509_get_notBefore(x509), 0);
+    X509_gmtime_adj(X509_get_notAfter(x509), 86400L);
+    X509_set_pubkey(x509, pkey);
+    name = X509_get_subject_name(x509);
+    X509_NAME_add_entry_by_txt(name, "CN", MBSTRING_ASC, (const unsigned char*)"localhost", -1, -1, 0);
+    X509_set_issuer_name(x509, name);
+    if (!X509_sign(x509, pkey, EVP_sha256()))
+        die("X509_sign");
+    return x509;
+}
+
+static SSL_CTX* make_ctx(int server, const char* groups)
+{
+#if OPENSSL_VERSION_NUMBER < 0x10100000L
+    SSL_CTX* ctx = SSL_CTX_new(server ? SSLv23_server_method() : SSLv23_client_method());
+#else
+    SSL_CTX* ctx = SSL_CTX_new(server ? TLS_server_method() : TLS_client_method());
+#endif
+    if (ctx == NULL)
+        die("SSL_CTX_new");
+    SSL_CTX_set_options(ctx, SSL_OP_NO_TICKET);
+    SSL_CTX_set_session_cache_mode(ctx, SSL_SESS_CACHE_OFF);
+    SSL_CTX_set_verify(ctx, SSL_VERIFY_NONE, NULL);
+#ifdef SSL_CTX_set_ecdh_auto
+    SSL_CTX_set_ecdh_auto(ctx, 1);
+#endif
+    if (!SSL_CTX_set1_curves_list(ctx, groups)) {
+        SSL_CTX_free(ctx);
+        ERR_clear_error();
+        return NULL;
+    }
+    return ctx;
+}
+
+static void handshake_once(void* arg)
+{
+    handshake_ctx* const hs = (handshake_ctx*)arg;
+    SSL* const server = SSL_new(hs->server);
+    SSL* const client = SSL_new(hs->client);
+    BIO* server_bio = NULL;
+    BIO* client_bio = NULL;
+    int server_done = 0;
+    int client_done = 0;
+    int rounds = 0;
+
+    if (server == NULL || client == NULL || !BIO_new_bio_pair(&server_bio, 0, &client_bio, 0))
+        die("handshake setup");
+    SSL_set_bio(server, server_bio, server_bio);
+    SSL_set_bio(client, client_bio, client_bio);
+    SSL_set_accept_state(server);
+    SSL_set_connect_state(client);
+
+    while (!server_done || !client_done) {
+        if (!client_done) {
+            int const ret = SSL_do_handshake(client);
+            int const err = SSL_get_error(client, ret);
+            if (ret == 1)
+                client_done = 1;
+            else if (err != SSL_ERROR_WANT_READ && err != SSL_ERROR_WANT_WRITE)
+                die("client handshake");
+        }
+        if (!server_done) {
+            int const ret = SSL_do_handshake(server);
+            int const err = SSL_get_error(server, ret);
+            if (ret == 1)
+                server_done = 1;
+            else if (err != SSL_ERROR_WANT_READ && err != SSL_ERROR_WANT_WRITE)
+                die("server handshake");
+        }
+        if (++rounds > 100)
+            die("handshake completion");
+    }
+    SSL_free(server);
+    SSL_free(client);
+}
+
+static void bench_handshake(bench_report* report, const char* workload, EVP_PKEY* key, const char* groups,
+                            double seconds)
+{
+    handshake_ctx hs;
+    X509* const cert = make_self_signed_cert(key);
+    hs.server = make_ctx(1, groups);
+    hs.client = make_ctx(0, groups);
+    if (hs.server == NULL || hs.client == NULL) {
+        bench_report_skip(workload, "key exchange group not supported");
+    } else {
+        if (!SSL_CTX_use_certificate(hs.server, cert) || !SSL_CTX_use_PrivateKey(hs.server, key))
+            die("server credentials");
+        bench_report_add(report, workload, "handshakes/s", bench_rate(handshake_once, &hs, seconds));
+    }
+    SSL_CTX_free(hs.server);
+    SSL_CTX_free(hs.client);
+    X509_free(cert);
+}
+
+static void aead_seal_record(void* arg)
+{
+    aead_ctx* const a = (aead_ctx*)arg;
+    unsigned char tag[16];
+    int len = 0;
+    if (!EVP_EncryptInit_ex(a->ctx, a->cipher, NULL, a->key, a->iv) ||
+        !EVP_EncryptUpdate(a->ctx, a->out, &len, a->in, sizeof(a->in)) ||
+        !EVP_EncryptFinal_ex(a->ctx, a->out + len, &len) ||
+        !EVP_CIPHER_CTX_ctrl(a->ctx, EVP_CTRL_GCM_GET_TAG, sizeof(tag), tag))
+        die("AEAD encryption");
+    ++a->iv[11];
+}
+
+static void bench_aead(bench_report* report, const char* workload, const EVP_CIPHER* cipher, double seconds)
+{
+    aead_ctx* const a = (aead_ctx*)calloc(1, sizeof(aead_ctx));
+    if (a == NULL || (a->ctx = EVP_CIPHER_CTX_new()) == NULL)
+        die("AEAD setup");
+    a->cipher = cipher;
+    memset(a->key, 0x42, sizeof(a->key));
+    bench_report_add(report, workload, "GB/s", bench_rate(aead_seal_record, a, seconds) * sizeof(a->in) / 1e9);
+    EVP_CIPHER_CTX_free(a->ctx);
+    free(a);
+}
+
+#if defined(LIBRESSL_VERSION_NUMBER)
+typedef struct {
+    EVP_AEAD_CTX ctx;
+    unsigned char nonce[12];
+    unsigned char in[BENCH_RECORD_SIZE];
+    unsigned char out[BENCH_RECORD_SIZE + 16];
+} libressl_aead_ctx;
+
+static void libressl_aead_seal_record(void* arg)
+{
+    libressl_aead_ctx* const a = (libressl_aead_ctx*)arg;
+    size_t out_len = 0;
+    if (!EVP_AEAD_CTX_seal(&a->ctx, a->out, &out_len, sizeof(a->out), a->nonce, sizeof(a->nonce),
+                           a->in, sizeof(a->in), NULL, 0))
+        die("AEAD encryption");
+    ++a->nonce[11];
+}
+
+static void bench_libressl_chacha20_poly1305(bench_report* report, double seconds)
+{
+    unsigned char key[32];
+    libressl_aead_ctx* const a = (libressl_aead_ctx*)calloc(1, sizeof(libressl_aead_ctx));
+    memset(key, 0x42, sizeof(key));
+    if (a == NULL || !EVP_AEAD_CTX_init(&a->ctx, EVP_aead_chacha20_poly1305(), key, sizeof(key), 16, NULL))
+        die("AEAD setup");
+    bench_report_add(report, "chacha20_poly1305", "GB/s",
+                     bench_rate(libressl_aead_seal_record, a, seconds) * sizeof(a->in) / 1e9);
+    EVP_AEAD_CTX_cleanup(&a->ctx);
+    free(a);
+}
+#endif
+
+static void sha256_buffer(void* arg)
+{
+    unsigned char digest[EVP_MAX_MD_SIZE];
+    if (!EVP_Digest(arg, BENCH_HASH_SIZE, digest, NULL, EVP_sha256(), NULL))
+        die("SHA-256");
+}
+
+int main(int argc, char** argv)
+{
+    double seconds = 2.0;
+    const char* json = "tls_benchmark_" BENCH_LIBRARY ".json";
+    bench_report report;
+    EVP_PKEY* rsa;
+    EVP_PKEY* p256;
+    unsigned char* hash_input;
+
+    bench_parse_args(argc, argv, &seconds, &json);
+#if OPENSSL_VERSION_NUMBER < 0x10100000L
+    SSL_library_init();
+    SSL_load_error_strings();
+#endif
+    bench_report_open(&report, json, BENCH_LIBRARY, OPENSSL_VERSION_TEXT);
+
+    rsa = make_rsa_key();
+    p256 = make_p256_key();
+    bench_handshake(&report, "handshake_rsa2048", rsa, "P-256", seconds);
+    bench_handshake(&report, "handshake_ecdsa_p256", p256, "P-256", seconds);
+    bench_handshake(&report, "handshake_x25519", p256, "X25519:P-256", seconds);
+    EVP_PKEY_free(rsa);
+    EVP_PKEY_free(p256);
+
+    bench_aead(&report, "aes_256_gcm", EVP_aes_256_gcm(), seconds);
+#if BENCH_HAS_EVP_CHACHA20_POLY1305
+    bench_aead(&report, "chacha20_poly1305", EVP_chacha20_poly1305(), seconds);
+#elif defined(LIBRESSL_VERSION_NUMBER)
+    bench_libressl_chacha20_poly1305(&report, seconds);
+#else
+    bench_report_skip("chacha20_poly1305", "not available before OpenSSL 1.1.0");
+#endif
+
+    hash_input = (unsigned char*)calloc(1, BENCH_HASH_SIZE);
+    if (hash_input == NULL)
+        die("allocation");
+    bench_report_add(&report, "sha256", "GB/s", bench_rate(sha256_buffer, hash_input, seconds) * BENCH_HASH_SIZE / 1e9);
+    free(hash_input);
+
+    bench_report_close(&report);
+    printf("results written to %s\n", json);
+    return 0;
+}
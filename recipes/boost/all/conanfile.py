@@ -5,7 +5,10 @@ from conans.tools import Version
 from conans.errors import ConanException
 
 from conans.errors import ConanInvalidConfiguration
+import fasteners
+import hashlib
 import os
+import re
 import sys
 import shutil
 
@@ -53,7 +56,9 @@ class BoostConan(ConanFile):
         "lzma": [True, False],
         "zstd": [True, False],
         "segmented_stacks": [True, False],
-        "extra_b2_flags": "ANY"  # custom b2 flags
+        "extra_b2_flags": "ANY",  # custom b2 flags
+        "bootstrap_b2": [True, False],  # build the b2 engine from the boost sources instead of using the b2 package
+        "multi_variant": [True, False]  # build debug/release and static/shared in one b2 pass shared by all packages
     }
     options.update({"without_%s" % libname: [True, False] for libname in lib_list})
 
@@ -77,6 +82,8 @@ class BoostConan(ConanFile):
         'zstd': False,
         'segmented_stacks': False,
         'extra_b2_flags': 'None',
+        'bootstrap_b2': False,
+        'multi_variant': False,
     }
 
     for libname in lib_list:
@@ -116,6 +123,20 @@ class BoostConan(ConanFile):
         if self.settings.os == "Windows":
             del self.options.fPIC
 
+    def configure(self):
+        if self.options.multi_variant and self.options.layout == "system":
+            raise ConanInvalidConfiguration("multi_variant needs distinct library names for each variant, "
+                                            "use layout=tagged or layout=versioned")
+        if self.options.multi_variant and self._zip_bzip2_requires_needed and \
+                any(self.options.get_safe(lib) for lib in ["zlib", "bzip2", "lzma", "zstd"]):
+            # one b2 run builds debug and release, it cannot link each against its own compression packages
+            raise ConanInvalidConfiguration("multi_variant cannot be used with the zlib, bzip2, lzma or zstd "
+                                            "options, disable them or without_iostreams")
+
+    def build_requirements(self):
+        if not self.options.header_only and not self.options.bootstrap_b2:
+            self.build_requires("b2/4.1.0")
+
     def requirements(self):
         if self._zip_bzip2_requires_needed:
             if self.options.zlib:
@@ -133,6 +154,8 @@ class BoostConan(ConanFile):
             self.info.options.header_only = True
         else:
             del self.info.options.python_executable  # PATH to the interpreter is not important, only version matters
+            del self.info.options.bootstrap_b2  # the engine only drives the build, it doesn't change the binaries
+            del self.info.options.multi_variant  # the same binaries are packaged, only the build tree is shared
             if self.options.without_python:
                 del self.info.options.python_version
             else:
@@ -327,7 +350,10 @@ class BoostConan(ConanFile):
 
     @property
     def _b2_exe(self):
-        folder = os.path.join(self.source_folder, self._folder_name, "tools", "build")
+        if self.options.bootstrap_b2:
+            folder = os.path.join(self.source_folder, self._folder_name, "tools", "build")
+        else:
+            folder = os.path.join(self.deps_cpp_info["b2"].rootpath, "bin")
         return os.path.join(folder, "b2.exe" if tools.os_info.is_windows else "b2")
 
     @property
@@ -347,6 +373,55 @@ class BoostConan(ConanFile):
     def _boost_build_dir(self):
         return os.path.join(self.source_folder, self._folder_name, "tools", "build")
 
+    def _multi_variant_flags(self, flags):
+        return [flag for flag in flags if not flag.startswith(("link=", "variant="))]
+
+    def _compute_multi_variant_dir(self, flags):
+        """
+        build tree shared by the packages that only differ in build_type and shared
+        :return: the folder keyed by everything else that reaches the compiler: the b2 flags (without
+                 variant and link), the compiler settings, the toolset configured in user-config.jam,
+                 the compiler environment, the version and the recipe
+        """
+        key = hashlib.sha1()
+        key.update(str(self.version).encode())
+        # the recipe file stands in for the recipe revision
+        key.update(tools.load(__file__).encode())
+        for flag in self._multi_variant_flags(flags):
+            key.update(flag.encode())
+        for setting in ["compiler", "compiler.version", "compiler.libcxx", "compiler.threads",
+                        "compiler.exception", "os", "arch"]:
+            key.update(("%s=%s;" % (setting, self.settings.get_safe(setting))).encode())
+        # MD/MDd and MT/MTd follow build_type, so only the static/dynamic choice is part of the key
+        runtime = self.settings.get_safe("compiler.runtime")
+        if runtime:
+            key.update(("compiler.runtime=%s;" % str(runtime).rstrip("d")).encode())
+        # the parts of user-config.jam that do not depend on build_type; configure() rejects the
+        # compression libraries, whose package folders differ between Debug and Release
+        key.update(("toolset=%s:%s:%s;" % self._get_toolset_version_and_exe()).encode())
+        if not self.options.without_python:
+            key.update(("python=%s:%s;" % (self._python_version, self._python_executable)).encode())
+        for var in ["CC", "CXX", "AR", "RANLIB", "CFLAGS", "CXXFLAGS", "CPPFLAGS", "LDFLAGS", "ASFLAGS"]:
+            key.update(("%s=%s;" % (var, os.environ.get(var, ""))).encode())
+        base = tools.get_env("CONAN_BOOST_MULTI_VARIANT_DIR",
+                             os.path.join(os.path.dirname(self.build_folder), "multi_variant"))
+        return os.path.join(base, key.hexdigest())
+
+    @property
+    def _multi_variant_dir_file(self):
+        return os.path.join(self.build_folder, "multi_variant_dir.txt")
+
+    @property
+    def _multi_variant_dir(self):
+        # computed once in build(), package() must use the same folder
+        return tools.load(self._multi_variant_dir_file).strip()
+
+    @property
+    def _stage_lib_dir(self):
+        if self.options.multi_variant:
+            return os.path.join(self._multi_variant_dir, "stage", "lib")
+        return os.path.join(self.source_folder, self._boost_dir, "stage", "lib")
+
     def _build_bcp(self):
         folder = os.path.join(self.source_folder, self._folder_name, 'tools', 'bcp')
         with tools.vcvars(self.settings) if self._is_msvc else tools.no_op():
@@ -354,7 +429,9 @@ class BoostConan(ConanFile):
                 toolset, _, _ = self._get_toolset_version_and_exe()
                 command = "%s -j%s --abbreviate-paths -d2 toolset=%s" % (self._b2_exe, tools.cpu_count(), toolset)
                 self.output.warn(command)
-                self.run(command)
+                # the b2 package points BOOST_BUILD_PATH to its own build system, use the one of these sources
+                with tools.environment_append({"BOOST_BUILD_PATH": self._boost_build_dir}):
+                    self.run(command)
 
     def _run_bcp(self):
         with tools.vcvars(self.settings) if self._is_msvc else tools.no_op():
@@ -387,7 +464,8 @@ class BoostConan(ConanFile):
             return
 
         self._clean()
-        self._bootstrap()
+        if self.options.bootstrap_b2:
+            self._bootstrap()
 
         if self._use_bcp:
             self._build_bcp()
@@ -397,12 +475,33 @@ class BoostConan(ConanFile):
         # Help locating bzip2 and zlib
         self._create_user_config_jam(self._boost_build_dir)
 
+        if not self.options.multi_variant:
+            self._run_b2(flags, self.build_folder)
+            return
+
+        multi_variant_dir = self._compute_multi_variant_dir(flags)
+        tools.save(self._multi_variant_dir_file, multi_variant_dir)
+        tools.mkdir(multi_variant_dir)
+        # concurrent builds of the other variants wait for the first one to finish
+        with fasteners.InterProcessLock(os.path.join(multi_variant_dir, "lock")):
+            marker = os.path.join(multi_variant_dir, "complete")
+            if os.path.isfile(marker):
+                self.output.info("Reusing the multi variant build in %s" % multi_variant_dir)
+                return
+            flags = self._multi_variant_flags(flags)
+            flags.extend(["variant=debug,release",
+                          "link=static,shared",
+                          '--stagedir="%s"' % os.path.join(multi_variant_dir, "stage")])
+            self._run_b2(flags, os.path.join(multi_variant_dir, "build"))
+            tools.save(marker, "")
+
+    def _run_b2(self, flags, build_dir):
         # JOIN ALL FLAGS
         b2_flags = " ".join(flags)
         full_command = "%s %s -j%s --abbreviate-paths -d2" % (self._b2_exe, b2_flags, tools.cpu_count())
         # -d2 is to print more debug info and avoid travis timing out without output
         sources = os.path.join(self.source_folder, self._boost_dir)
-        full_command += ' --debug-configuration --build-dir="%s"' % self.build_folder
+        full_command += ' --debug-configuration --build-dir="%s"' % build_dir
         self.output.warn(full_command)
 
         with tools.vcvars(self.settings) if self._is_msvc else tools.no_op():
@@ -420,9 +519,7 @@ class BoostConan(ConanFile):
     def _create_emscripten_libs(self):
         # Boost Build doesn't create the libraries, but it gets close,
         # leaving .bc files where the libraries would be.
-        staged_libs = os.path.join(
-            self.source_folder, self._boost_dir, "stage", "lib"
-        )
+        staged_libs = self._stage_lib_dir
         for bc_file in os.listdir(staged_libs):
             if bc_file.startswith("lib") and bc_file.endswith(".bc"):
                 a_file = bc_file[:-3] + ".a"
@@ -851,12 +948,36 @@ class BoostConan(ConanFile):
 
     ####################################################################
 
+    @staticmethod
+    def _is_debug_library(filename):
+        # tagged and versioned layouts add an ABI tag such as -d, -gd or -sgd to debug libraries
+        tags = filename.split(".")[0].split("-")[1:]
+        return any(re.match(r"^s?g?y?dp?n?$", tag) for tag in tags)
+
+    @staticmethod
+    def _is_shared_library(filename):
+        if filename.endswith(".lib"):
+            return not filename.startswith("lib")  # import library, static ones are prefixed by lib
+        return filename.endswith((".dll", ".dll.a", ".dylib")) or ".so" in filename
+
+    def _package_multi_variant_libs(self):
+        debug = self.settings.build_type == "Debug"
+        for filename in os.listdir(self._stage_lib_dir):
+            if self._is_debug_library(filename) != debug or \
+               self._is_shared_library(filename) != bool(self.options.shared):
+                continue
+            dst = "bin" if filename.endswith(".dll") else "lib"
+            self.copy(pattern=filename, dst=dst, src=self._stage_lib_dir, keep_path=False, symlinks=True)
+
     def package(self):
         # This stage/lib is in source_folder... Face palm, looks like it builds in build but then
         # copy to source with the good lib name
         self.copy("LICENSE_1_0.txt", dst="licenses", src=os.path.join(self.source_folder, self._folder_name))
         out_lib_dir = os.path.join(self._boost_dir, "stage", "lib")
         self.copy(pattern="*", dst="include/boost", src="%s/boost" % self._boost_dir)
+        if self.options.multi_variant:
+            self._package_multi_variant_libs()
+            return
         if not self.options.shared:
             self.copy(pattern="*.a", dst="lib", src=out_lib_dir, keep_path=False)
         self.copy(pattern="*.so", dst="lib", src=out_lib_dir, keep_path=False, symlinks=True)
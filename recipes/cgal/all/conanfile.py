@@ -11,7 +11,7 @@ class CgalConan(ConanFile):
                   "in computational geometry."
     topics = ("geometry", "algorithms")
     settings = "os", "compiler", "build_type", "arch"
-    requires = "mpir/3.0.0", "mpfr/4.0.2", "boost/1.71.0", "eigen/3.3.7"
+    requires = "boost/1.71.0", "eigen/3.3.7"
     generators = "cmake"
 
     _source_subfolder = "source_subfolder"
@@ -20,21 +20,39 @@ class CgalConan(ConanFile):
     options = {
         "with_cgal_core": [True, False],
         "with_cgal_qt5": [True, False],
-        "with_cgal_imageio": [True, False]
+        "with_cgal_imageio": [True, False],
+        "with_gmp": [True, False],
+        "with_tbb": [True, False]
     }
 
     default_options = {
         "with_cgal_core": True,
         "with_cgal_qt5": False,
-        "with_cgal_imageio": True
+        "with_cgal_imageio": True,
+        "with_gmp": True,
+        "with_tbb": False
     }
 
+    def configure(self):
+        if not self.options.with_gmp:
+            # CGAL_Core is built on GMP
+            del self.options.with_cgal_core
+
+    def requirements(self):
+        if self.options.with_gmp:
+            # mpir is built with --enable-gmpcompat and is the GMP that mpfr links to
+            self.requires("mpir/3.0.0")
+            self.requires("mpfr/4.0.2")
+        if self.options.with_tbb:
+            self.requires("tbb/2020.0")
+
     def _configure_cmake(self):
         if not self._cmake:
             self._cmake = CMake(self)
-            self._cmake.definitions["WITH_CGAL_Core"] = self.options.with_cgal_core
+            self._cmake.definitions["WITH_CGAL_Core"] = bool(self.options.get_safe("with_cgal_core"))
             self._cmake.definitions["WITH_CGAL_Qt5"] = self.options.with_cgal_qt5
             self._cmake.definitions["WITH_CGAL_ImageIO"] = self.options.with_cgal_imageio
+            self._cmake.definitions["CGAL_DISABLE_GMP"] = not self.options.with_gmp
             self._cmake.configure(source_folder=self._source_subfolder)
         return self._cmake
 
@@ -66,6 +84,15 @@ conan_basic_setup()''')
     def package_info(self):
         self.cpp_info.names["cmake_find_package"] = "CGAL"
         self.cpp_info.names["cmake_find_package_multi"] = "CGAL"
+        if self.options.with_gmp:
+            self.cpp_info.defines.extend(["CGAL_USE_GMP", "CGAL_USE_MPFR"])
+        else:
+            # exact number types fall back to CGAL's own and Boost.Multiprecision ones
+            self.cpp_info.defines.append("CGAL_NO_GMP=1")
+        if self.options.with_tbb:
+            # enables the Parallel_tag versions of mesh generation, point set
+            # processing and spatial sorting
+            self.cpp_info.defines.append("CGAL_LINKED_WITH_TBB")
 
     def package_id(self):
         self.info.header_only()
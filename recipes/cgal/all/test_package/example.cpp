@@ -1,5 +1,17 @@
 #include <CGAL/Epick_d.h>
 #include <CGAL/Delaunay_triangulation.h>
+#include <CGAL/Exact_predicates_inexact_constructions_kernel.h>
+#include <CGAL/point_generators_3.h>
+#include <CGAL/spatial_sort.h>
+
+#include <algorithm>
+#include <iterator>
+
+#ifdef CGAL_LINKED_WITH_TBB
+typedef CGAL::Parallel_tag Concurrency_tag;
+#else
+typedef CGAL::Sequential_tag Concurrency_tag;
+#endif
 
 int main()
 {
@@ -35,6 +47,17 @@ int main()
     }
     printf("Processing: %d/%d\n", ++i, (int)points.size());
   }
+
+  typedef CGAL::Exact_predicates_inexact_constructions_kernel::Point_3 Point_3;
+  std::vector<Point_3> cloud;
+  std::copy_n(CGAL::Random_points_in_cube_3<Point_3>(1.0), 10000, std::back_inserter(cloud));
+  CGAL::spatial_sort<Concurrency_tag>(cloud.begin(), cloud.end());
+  printf("Spatially sorted %d points (%s)\n", (int)cloud.size(),
+#ifdef CGAL_LINKED_WITH_TBB
+         "parallel");
+#else
+         "sequential");
+#endif
   return 0;
 }
 
@@ -1,5 +1,6 @@
 import os
 from conans import ConanFile, tools
+from conans.errors import ConanInvalidConfiguration
 
 class eigenConan(ConanFile):
     name = "eigen"
@@ -10,9 +11,29 @@ class eigenConan(ConanFile):
     license = "MPL-2.0"
     topics = ("eigen", "algebra", "linear-algebra", "vector", "numerical")
     settings = "os", "compiler", "arch", "build_type"
+    # These only change the defines propagated to consumers, so that every
+    # translation unit of a binary sees the same Eigen configuration
+    options = {"blas": [False, "openblas"],
+               "lapacke": [True, False],
+               "max_align_bytes": ["default", 0, 16, 32, 64],
+               "vectorize": [True, False]}
+    default_options = {"blas": False,
+                       "lapacke": False,
+                       "max_align_bytes": "default",
+                       "vectorize": True}
     _source_subfolder = "_source_subfolder"
     no_copy_source = True
 
+    def configure(self):
+        if self.options.lapacke:
+            if not self.options.blas:
+                raise ConanInvalidConfiguration("eigen:lapacke=True requires a BLAS backend (eigen:blas)")
+            self.options["openblas"].build_lapack = True
+
+    def requirements(self):
+        if self.options.blas == "openblas":
+            self.requires("openblas/0.3.7")
+
     def source(self):
         tools.get(**self.conan_data["sources"][self.version])
         #Get te extracted folder name. They allways have the format eigen-eigen-xxxxxx
@@ -44,3 +65,11 @@ class eigenConan(ConanFile):
         self.cpp_info.includedirs = [os.path.join("include","eigen3")]
         if self.settings.os == "Linux":
             self.cpp_info.system_libs = ["m"]
+        if self.options.blas:
+            self.cpp_info.defines.append("EIGEN_USE_BLAS")
+        if self.options.lapacke:
+            self.cpp_info.defines.append("EIGEN_USE_LAPACKE")
+        if self.options.max_align_bytes != "default":
+            self.cpp_info.defines.append("EIGEN_MAX_ALIGN_BYTES=%s" % self.options.max_align_bytes)
+        if not self.options.vectorize:
+            self.cpp_info.defines.append("EIGEN_DONT_VECTORIZE")
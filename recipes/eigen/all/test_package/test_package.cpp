@@ -1,5 +1,6 @@
 #include <iostream>
 #include <Eigen/Core>
+#include <Eigen/LU>
 #include <unsupported/Eigen/MatrixFunctions>
 
 
@@ -11,6 +12,13 @@ int main(void)
 
     std::cout << "A =\n" << A << '\n' <<std::endl;
     std::cout << "A(2..3,:) =\n" << A.middleRows(2, 2) << std::endl;
-    
-    return 0;
-}
\ No newline at end of file
+
+    // large enough for the BLAS/LAPACKE backends, when enabled, to be used
+    Eigen::MatrixXd B = Eigen::MatrixXd::Random(64, 64) + 64 * Eigen::MatrixXd::Identity(64, 64);
+    Eigen::MatrixXd const product = B * B.transpose();
+    Eigen::MatrixXd const inverse = B.partialPivLu().inverse();
+    double const error = (B * inverse - Eigen::MatrixXd::Identity(64, 64)).norm();
+    std::cout << "trace(B * B^T) = " << product.trace() << ", |B * inv(B) - I| = " << error << std::endl;
+
+    return error < 1e-9 ? 0 : 1;
+}
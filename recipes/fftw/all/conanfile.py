@@ -1,5 +1,7 @@
 from conans import ConanFile, CMake, tools
+from conans.errors import ConanInvalidConfiguration
 import os
+import re
 
 
 class FFTWConan(ConanFile):
@@ -9,60 +11,166 @@ class FFTWConan(ConanFile):
     homepage = "http://www.fftw.org/"
     license = "GPL-2.0"
     topics = ("conan", "fftw", "dft", "dct", "dst")
-    exports_sources = ["CMakeLists.txt"]
+    exports_sources = ["CMakeLists.txt", "fftw_wisdom_cache.h"]
     generators = "cmake"
     settings = "os", "arch", "compiler", "build_type"
     options = {"shared": [True, False],
                "fPIC": [True, False],
                "precision": ["double", "single", "longdouble"],
+               "precisions": "ANY",
                "openmp": [True, False],
                "threads": [True, False],
-               "combinedthreads": [True, False]}
+               "combinedthreads": [True, False],
+               "sse2": [True, False],
+               "avx": [True, False],
+               "avx2": [True, False],
+               "wisdom_tool": [True, False]}
     default_options = {'shared': False,
                        'fPIC': True,
                        'precision': 'double',
+                       'precisions': None,
                        'openmp': False,
                        'threads': False,
-                       'combinedthreads': False}
+                       'combinedthreads': False,
+                       'sse2': True,
+                       'avx': False,
+                       'avx2': False,
+                       'wisdom_tool': False}
     _source_subfolder = "source_subfolder"
     _build_subfolder = "build_subfolder"
 
+    @property
+    def _precisions(self):
+        # precisions is a comma separated list, e.g. "single,double", that builds
+        # fftw3f and fftw3 into the same package; it overrides precision
+        if self.options.precisions:
+            return [precision.strip() for precision in str(self.options.precisions).split(",") if precision.strip()]
+        return [str(self.options.precision)]
+
+    @staticmethod
+    def _prefix(precision):
+        return {"double": "fftw", "single": "fftwf", "longdouble": "fftwl"}[precision]
+
+    @property
+    def _simd_options(self):
+        return ["sse2", "avx", "avx2"]
+
     def configure(self):
         del self.settings.compiler.libcxx
         del self.settings.compiler.cppstd
+        for precision in self._precisions:
+            if precision not in ["double", "single", "longdouble"]:
+                raise ConanInvalidConfiguration("fftw precisions must be a list of double, single and longdouble, "
+                                                "got '%s'" % self.options.precisions)
+        if self._precisions == ["longdouble"]:
+            # SIMD codelets only exist for single and double precision
+            for option in self._simd_options:
+                if self.options.get_safe(option) is not None:
+                    self.options.remove(option)
 
     def config_options(self):
         if self.settings.os == 'Windows':
             del self.options.fPIC
+        if self.settings.arch not in ["x86", "x86_64"]:
+            for option in self._simd_options:
+                self.options.remove(option)
 
     def source(self):
         tools.get(**self.conan_data["sources"][self.version])
         extracted_dir = self.name + "-" + self.version
         os.rename(extracted_dir, self._source_subfolder)
 
-    def _configure_cmake(self):
+    def _patch_sources(self):
+        # The CMake build adds the -msse2/-mavx/-mavx2/-mfma flags to the whole
+        # library, so the compiler may emit those instructions in generic code and
+        # the library crashes on older CPUs despite FFTW's runtime SIMD detection.
+        # Restrict them to the codelets, which are only called after that check.
+        cmakelists = os.path.join(self._source_subfolder, "CMakeLists.txt")
+        content = tools.load(cmakelists)
+        content = re.sub(r"target_compile_options\s*\(\s*\$\{\w+\}\s+PRIVATE\s+\$\{(SSE|SSE2|AVX|AVX2|FMA)_FLAG\}\s*\)",
+                         "", content)
+        content += """
+if (HAVE_SSE2)
+  file (GLOB conan_sse2_codelets dft/simd/sse2/*.c rdft/simd/sse2/*.c)
+  set_source_files_properties (${conan_sse2_codelets} PROPERTIES COMPILE_FLAGS "${SSE2_FLAG}")
+endif ()
+if (HAVE_AVX)
+  file (GLOB conan_avx_codelets dft/simd/avx/*.c rdft/simd/avx/*.c)
+  set_source_files_properties (${conan_avx_codelets} PROPERTIES COMPILE_FLAGS "${AVX_FLAG}")
+endif ()
+if (HAVE_AVX2)
+  file (GLOB conan_avx2_codelets dft/simd/avx2/*.c dft/simd/avx2-128/*.c rdft/simd/avx2/*.c rdft/simd/avx2-128/*.c)
+  set_source_files_properties (${conan_avx2_codelets} PROPERTIES COMPILE_FLAGS "${AVX2_FLAG} ${FMA_FLAG}")
+endif ()
+"""
+        # The CMake build has no target for the fftw-wisdom tool, add it the way
+        # tools/Makefile.am links it: the tool, the bench driver and libbench2
+        content += """
+if (CONAN_FFTW_WISDOM_TOOL)
+  file (GLOB conan_libbench2_sources libbench2/*.c)
+  add_library (conan_bench2 STATIC ${conan_libbench2_sources})
+  add_executable (${CONAN_FFTW_WISDOM_TOOL} tools/fftw-wisdom.c tests/bench.c tests/fftw-bench.c)
+  if (TARGET ${CONAN_FFTW_LIB}_threads)
+    target_link_libraries (${CONAN_FFTW_WISDOM_TOOL} ${CONAN_FFTW_LIB}_threads)
+  elseif (TARGET ${CONAN_FFTW_LIB}_omp)
+    target_link_libraries (${CONAN_FFTW_WISDOM_TOOL} ${CONAN_FFTW_LIB}_omp)
+  endif ()
+  target_link_libraries (${CONAN_FFTW_WISDOM_TOOL} ${CONAN_FFTW_LIB} conan_bench2 ${CMAKE_THREAD_LIBS_INIT})
+  if (UNIX)
+    target_link_libraries (${CONAN_FFTW_WISDOM_TOOL} m)
+  endif ()
+  install (TARGETS ${CONAN_FFTW_WISDOM_TOOL} RUNTIME DESTINATION bin)
+endif ()
+"""
+        tools.save(cmakelists, content)
+
+    def _configure_cmake(self, precision):
         cmake = CMake(self)
         cmake.definitions["BUILD_TESTS"] = False
         cmake.definitions["ENABLE_OPENMP"] = self.options.openmp
         cmake.definitions["ENABLE_THREADS"] = self.options.threads
         cmake.definitions["WITH_COMBINED_THREADS"] = self.options.combinedthreads
-        cmake.definitions["ENABLE_FLOAT"] = self.options.precision == "single"
-        cmake.definitions["ENABLE_LONG_DOUBLE"] = self.options.precision == "longdouble"
-        cmake.configure(build_folder=self._build_subfolder)
+        cmake.definitions["ENABLE_FLOAT"] = precision == "single"
+        cmake.definitions["ENABLE_LONG_DOUBLE"] = precision == "longdouble"
+        simd = precision != "longdouble"
+        cmake.definitions["ENABLE_SSE2"] = simd and bool(self.options.get_safe("sse2"))
+        cmake.definitions["ENABLE_AVX"] = simd and bool(self.options.get_safe("avx"))
+        cmake.definitions["ENABLE_AVX2"] = simd and bool(self.options.get_safe("avx2"))
+        if self.options.wisdom_tool:
+            cmake.definitions["CONAN_FFTW_LIB"] = {"double": "fftw3", "single": "fftw3f", "longdouble": "fftw3l"}[precision]
+            cmake.definitions["CONAN_FFTW_WISDOM_TOOL"] = "%s-wisdom" % self._prefix(precision)
+        cmake.configure(build_folder="%s_%s" % (self._build_subfolder, precision))
         return cmake
 
     def build(self):
-        cmake = self._configure_cmake()
-        cmake.build()
+        self._patch_sources()
+        for precision in self._precisions:
+            cmake = self._configure_cmake(precision)
+            cmake.build()
 
     def package(self):
         self.copy(pattern="COPYRIGHT", dst="licenses", src=self._source_subfolder)
-        cmake = self._configure_cmake()
-        cmake.install()
+        self.copy(pattern="fftw_wisdom_cache.h", dst="include")
+        for precision in self._precisions:
+            cmake = self._configure_cmake(precision)
+            cmake.install()
         tools.rmdir(os.path.join(self.package_folder, "lib", "pkgconfig"))
         tools.rmdir(os.path.join(self.package_folder, "lib", "cmake"))
 
+    def package_id(self):
+        if self.options.precisions:
+            self.info.options.precisions = ",".join(sorted(set(self._precisions)))
+            del self.info.options.precision
+
     def package_info(self):
         self.cpp_info.libs = tools.collect_libs(self)
         if self.settings.os == "Linux":
             self.cpp_info.system_libs = ["m"]
+        if self.options.wisdom_tool:
+            bin_path = os.path.join(self.package_folder, "bin")
+            self.output.info("Appending PATH environment variable: {}".format(bin_path))
+            self.env_info.PATH.append(bin_path)
+            extension = ".exe" if self.settings.os == "Windows" else ""
+            for precision in self._precisions:
+                tool = "%s-wisdom" % self._prefix(precision)
+                setattr(self.user_info, tool.replace("-", "_"), os.path.join(bin_path, tool + extension))
@@ -0,0 +1,157 @@
+/*
+ * Loads and saves FFTW wisdom files keyed by the host CPU.
+ *
+ * Shipped by the Conan fftw package. Wisdom is only valid for the CPU it was
+ * measured on, so the file name contains a key derived from the CPU vendor,
+ * brand string and family/model/stepping (x86), or the target architecture
+ * otherwise:
+ *
+ *     <dir>/<prefix>-<cpu key>.wisdom
+ *
+ * The prefix separates precisions, e.g. "fftw3" or "fftw3f". Pass the import
+ * and export functions of the precision in use:
+ *
+ *     fftw_wisdom_cache_load("/var/cache/app", "fftw3", fftw_import_wisdom_from_filename);
+ *     plan = fftw_plan_dft_1d(n, in, out, FFTW_FORWARD, FFTW_MEASURE);
+ *     fftw_wisdom_cache_save("/var/cache/app", "fftw3", fftw_export_wisdom_to_filename);
+ *
+ * Both return non-zero on success. The cache directory must exist. Files for
+ * a machine type can also be generated ahead of time with the fftw-wisdom tool
+ * (wisdom_tool option), writing to the path from fftw_wisdom_cache_path().
+ */
+
+#ifndef CONAN_FFTW_WISDOM_CACHE_H
+#define CONAN_FFTW_WISDOM_CACHE_H
+
+#include <stdio.h>
+#include <string.h>
+
+#if defined(_MSC_VER) && (defined(_M_IX86) || defined(_M_X64))
+#include <intrin.h>
+#define FFTW_WISDOM_CACHE_X86_MSVC 1
+#elif (defined(__GNUC__) || defined(__clang__)) && (defined(__i386__) || defined(__x86_64__))
+#include <cpuid.h>
+#define FFTW_WISDOM_CACHE_X86_GNU 1
+#endif
+
+typedef int (*fftw_wisdom_cache_import_fn)(const char* filename);
+typedef int (*fftw_wisdom_cache_export_fn)(const char* filename);
+
+#if defined(FFTW_WISDOM_CACHE_X86_MSVC) || defined(FFTW_WISDOM_CACHE_X86_GNU)
+static void fftw_wisdom_cache_cpuid(unsigned int leaf, unsigned int regs[4])
+{
+#ifdef FFTW_WISDOM_CACHE_X86_MSVC
+    int info[4];
+    __cpuid(info, (int)leaf);
+    regs[0] = (unsigned int)info[0];
+    regs[1] = (unsigned int)info[1];
+    regs[2] = (unsigned int)info[2];
+    regs[3] = (unsigned int)info[3];
+#else
+    if (!__get_cpuid(leaf, &regs[0], &regs[1], &regs[2], &regs[3]))
+        regs[0] = regs[1] = regs[2] = regs[3] = 0;
+#endif
+}
+#endif
+
+/* Writes a file name friendly CPU identifier to key, e.g.
+ * "GenuineIntel-Intel-R-Core-TM-i7-8700-CPU-3.20GHz-6-158-10" */
+static void fftw_wisdom_cache_key(char* key, size_t size)
+{
+    char raw[128];
+    size_t i, j;
+    int dash = 0;
+#if defined(FFTW_WISDOM_CACHE_X86_MSVC) || defined(FFTW_WISDOM_CACHE_X86_GNU)
+    unsigned int regs[4];
+    char vendor[13];
+    char brand[49];
+    unsigned int leaf, family, model;
+
+    fftw_wisdom_cache_cpuid(0, regs);
+    memcpy(vendor, &regs[1], 4);
+    memcpy(vendor + 4, &regs[3], 4);
+    memcpy(vendor + 8, &regs[2], 4);
+    vendor[12] = '\0';
+
+    memset(brand, 0, sizeof(brand));
+    fftw_wisdom_cache_cpuid(0x80000000u, regs);
+    if (regs[0] >= 0x80000004u) {
+        for (leaf = 0; leaf < 3; ++leaf) {
+            fftw_wisdom_cache_cpuid(0x80000002u + leaf, regs);
+            memcpy(brand + 16 * leaf, regs, 16);
+        }
+    }
+
+    fftw_wisdom_cache_cpuid(1, regs);
+    family = (regs[0] >> 8) & 0xF;
+    model = (regs[0] >> 4) & 0xF;
+    if (family == 0xF)
+        family += (regs[0] >> 20) & 0xFF;
+    if (family == 0x6 || family >= 0xF)
+        model += ((regs[0] >> 16) & 0xF) << 4;
+    snprintf(raw, sizeof(raw), "%s-%s-%u-%u-%u", vendor, brand, family, model, regs[0] & 0xF);
+#elif defined(__aarch64__) || defined(_M_ARM64)
+    snprintf(raw, sizeof(raw), "generic-aarch64");
+#elif defined(__arm__) || defined(_M_ARM)
+    snprintf(raw, sizeof(raw), "generic-arm");
+#elif defined(__powerpc64__)
+    snprintf(raw, sizeof(raw), "generic-ppc64");
+#else
+    snprintf(raw, sizeof(raw), "generic");
+#endif
+
+    /* keep [A-Za-z0-9.], collapse everything else into single dashes */
+    for (i = 0, j = 0; raw[i] != '\0' && j + 1 < size; ++i) {
+        char const c = raw[i];
+        if ((c >= 'a' && c <= 'z') || (c >= 'A' && c <= 'Z') || (c >= '0' && c <= '9') || c == '.') {
+            if (dash && j > 0 && j + 2 < size)
+                key[j++] = '-';
+            key[j++] = c;
+            dash = 0;
+        } else {
+            dash = 1;
+        }
+    }
+    if (size > 0)
+        key[j] = '\0';
+}
+
+/* Writes <dir>/<prefix>-<cpu key>.wisdom to path; returns 0 if it does not fit */
+static int fftw_wisdom_cache_path(const char* dir, const char* prefix, char* path, size_t size)
+{
+    char key[128];
+    int written;
+    fftw_wisdom_cache_key(key, sizeof(key));
+    written = snprintf(path, size, "%s/%s-%s.wisdom", dir, prefix, key);
+    return written > 0 && (size_t)written < size;
+}
+
+static int fftw_wisdom_cache_load(const char* dir, const char* prefix, fftw_wisdom_cache_import_fn import_fn)
+{
+    char path[1024];
+    if (!fftw_wisdom_cache_path(dir, prefix, path, sizeof(path)))
+        return 0;
+    return import_fn(path);
+}
+
+/* Exports to a temporary file first, so concurrent readers never see a partial file */
+static int fftw_wisdom_cache_save(const char* dir, const char* prefix, fftw_wisdom_cache_export_fn export_fn)
+{
+    char path[1024];
+    char tmp[1040];
+    if (!fftw_wisdom_cache_path(dir, prefix, path, sizeof(path)))
+        return 0;
+    snprintf(tmp, sizeof(tmp), "%s.tmp", path);
+    if (!export_fn(tmp))
+        return 0;
+#ifdef _WIN32
+    remove(path);
+#endif
+    if (rename(tmp, path) != 0) {
+        remove(tmp);
+        return 0;
+    }
+    return 1;
+}
+
+#endif
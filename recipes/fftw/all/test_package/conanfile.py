@@ -6,13 +6,25 @@ class TestPackageConan(ConanFile):
     settings = "os", "compiler", "build_type", "arch"
     generators = "cmake"
 
+    @property
+    def _precisions(self):
+        if self.options["fftw"].precisions:
+            return [precision.strip() for precision in str(self.options["fftw"].precisions).split(",")
+                    if precision.strip()]
+        return [str(self.options["fftw"].precision)]
+
     def build(self):
         cmake = CMake(self)
-        cmake.definitions["ENABLE_SINGLE_PRECISION"] = self.options["fftw"].precision == "single"
-        cmake.definitions["ENABLE_LONG_DOUBLE_PRECISION"] = self.options["fftw"].precision == "longdouble"
+        cmake.definitions["FFTW_PRECISIONS"] = ";".join(self._precisions)
         cmake.configure()
         cmake.build()
 
     def test(self):
-        bin_path = os.path.join("bin", "test_package")
-        self.run(bin_path, run_environment=True)
+        for precision in self._precisions:
+            bin_path = os.path.join("bin", "test_package_%s" % precision)
+            self.run(bin_path, run_environment=True)
+            if self.options["fftw"].wisdom_tool:
+                tool = {"double": "fftw_wisdom", "single": "fftwf_wisdom", "longdouble": "fftwl_wisdom"}[precision]
+                wisdom_file = os.path.join(self.build_folder, "%s.wisdom" % tool)
+                self.run("\"%s\" -n -o \"%s\" cof64" % (getattr(self.deps_user_info["fftw"], tool), wisdom_file),
+                         run_environment=True)
@@ -1,15 +1,19 @@
 #include "fftw3.h"
+#include "fftw_wisdom_cache.h"
 
 // switch API to match the precision option (fftw_|fftwf_|fftwl)
 #if defined(ENABLE_SINGLE_PRECISION)
 typedef float real_t;
 #define FFTW_MANGLE(name) FFTW_MANGLE_FLOAT(name)
+#define WISDOM_PREFIX "fftw3f"
 #elif defined(ENABLE_LONG_DOUBLE_PRECISION)
 typedef long double real_t;
 #define FFTW_MANGLE(name) FFTW_MANGLE_LONG_DOUBLE(name)
+#define WISDOM_PREFIX "fftw3l"
 #else
 typedef double real_t;
 #define FFTW_MANGLE(name) FFTW_MANGLE_DOUBLE(name)
+#define WISDOM_PREFIX "fftw3"
 #endif
 
 int main() {
@@ -22,5 +26,9 @@ int main() {
     FFTW_MANGLE(destroy_plan)(plan);
     FFTW_MANGLE(free)(output);
     FFTW_MANGLE(free)(input);
+    // round trip the accumulated wisdom through the per-CPU cache helper
+    if (!fftw_wisdom_cache_save(".", WISDOM_PREFIX, FFTW_MANGLE(export_wisdom_to_filename)) ||
+        !fftw_wisdom_cache_load(".", WISDOM_PREFIX, FFTW_MANGLE(import_wisdom_from_filename)))
+        return 1;
     return 0;
 }
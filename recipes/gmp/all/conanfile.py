@@ -13,8 +13,9 @@ class GmpConan(ConanFile):
     homepage = "https://gmplib.org"
     settings = "os", "arch", "compiler", "build_type"
     options = {"shared": [True, False], "fPIC": [True, False], "disable_assembly": [True, False],
-               "run_checks": [True, False], "enable_cxx" : [True, False]}
-    default_options = {'shared': False, 'fPIC': True, 'disable_assembly': True, 'run_checks': False, "enable_cxx" : True}
+               "enable_fat": [True, False], "run_checks": [True, False], "enable_cxx" : [True, False]}
+    default_options = {'shared': False, 'fPIC': True, 'disable_assembly': False, 'enable_fat': True,
+                       'run_checks': False, "enable_cxx" : True}
 
     _source_subfolder = "source_subfolder"
     _autotools = None
@@ -22,10 +23,16 @@ class GmpConan(ConanFile):
     def config_options(self):
         if self.settings.os == "Windows":
             del self.options.fPIC
+        # fat binaries are only implemented for x86 family CPUs
+        if self.settings.arch not in ["x86", "x86_64"]:
+            del self.options.enable_fat
 
     def configure(self):
         if self.settings.compiler == 'Visual Studio':
             raise ConanInvalidConfiguration("The gmp package cannot be built on Visual Studio.")
+        if self.options.disable_assembly and "enable_fat" in self.options:
+            # fat binaries select assembly code at runtime, there is nothing to select without it
+            del self.options.enable_fat
 
         if not self.options.enable_cxx:
             del self.settings.compiler.libcxx
@@ -46,6 +53,8 @@ class GmpConan(ConanFile):
             configure_args = []
             if self.options.disable_assembly:
                 configure_args.append('--disable-assembly')
+            if self.options.get_safe("enable_fat"):
+                configure_args.append('--enable-fat')
             if self.options.shared:
                 configure_args.extend(["--enable-shared", "--disable-static"])
             else:
@@ -2,6 +2,7 @@ import glob
 import os
 
 from conans import CMake, ConanFile, tools
+from conans.errors import ConanInvalidConfiguration
 
 
 class LibHdf5Conan(ConanFile):
@@ -19,13 +20,19 @@ class LibHdf5Conan(ConanFile):
         "shared": [True, False],
         "fPIC": [True, False],
         "hl": [True, False],
-        "with_zlib": [True, False]
+        "with_zlib": [True, False],
+        "szip": [True, False],
+        "threadsafe": [True, False],
+        "parallel": [True, False]
     }
     default_options = {
         "shared": False,
         "fPIC": True,
         "hl": True,
-        "with_zlib": True
+        "with_zlib": True,
+        "szip": False,
+        "threadsafe": False,
+        "parallel": False
     }
 
     _source_subfolder = "source_subfolder"
@@ -35,9 +42,19 @@ class LibHdf5Conan(ConanFile):
         if self.settings.compiler == "Visual Studio":
             del self.options.fPIC
 
+    def configure(self):
+        if self.options.threadsafe and self.settings.os == "Windows" and not self.options.shared:
+            # Thread-local storage cleanup relies on DllMain
+            raise ConanInvalidConfiguration("threadsafe requires shared=True on Windows")
+        if self.options.threadsafe:
+            self.output.warn("threadsafe: only the HDF5 C API is thread-safe, "
+                             "the high-level and C++ wrappers are not")
+
     def requirements(self):
         if self.options.with_zlib:
             self.requires("zlib/1.2.11")
+        if self.options.szip:
+            self.requires("libaec/1.0.4")
 
     def source(self):
         tools.get(**self.conan_data["sources"][self.version])
@@ -71,6 +88,14 @@ class LibHdf5Conan(ConanFile):
         # Modules depending on options
         cmake.definitions["HDF5_BUILD_HL_LIB"] = self.options.hl
         cmake.definitions["HDF5_ENABLE_Z_LIB_SUPPORT"] = self.options.with_zlib
+        cmake.definitions["HDF5_ENABLE_SZIP_SUPPORT"] = self.options.szip
+        cmake.definitions["HDF5_ENABLE_SZIP_ENCODING"] = self.options.szip
+        cmake.definitions["HDF5_ENABLE_THREADSAFE"] = self.options.threadsafe
+        # MPI is not packaged: FindMPI picks up the system installation (MPICH, Open MPI)
+        cmake.definitions["HDF5_ENABLE_PARALLEL"] = self.options.parallel
+        # HDF5 refuses to combine thread safety or parallel I/O with the high-level
+        # and C++ libraries unless told otherwise; keep building them as before
+        cmake.definitions["ALLOW_UNSUPPORTED"] = self.options.threadsafe or self.options.parallel
 
         cmake.configure(build_folder=self._build_subfolder)
         return cmake
@@ -137,3 +162,8 @@ class LibHdf5Conan(ConanFile):
 
         if self.settings.os != "Windows":
             self.cpp_info.system_libs.append("dl")
+        if self.options.threadsafe and self.settings.os == "Linux":
+            self.cpp_info.system_libs.append("pthread")
+        if self.options.parallel and self.settings.os == "Linux":
+            # Both MPICH and Open MPI provide libmpi; consumers build with the MPI compiler wrappers
+            self.cpp_info.system_libs.append("mpi")
@@ -1,8 +1,11 @@
 import os
 import glob
+import hashlib
+import json
 import platform
 import shutil
 from conans import ConanFile, tools, AutoToolsBuildEnvironment
+from conans.errors import ConanException, ConanInvalidConfiguration
 
 
 class ICUBase(ConanFile):
@@ -17,17 +20,22 @@ class ICUBase(ConanFile):
     _build_subfolder = "build_subfolder"
     _env_build = None
     short_paths = True
+    exports_sources = ["icu_mmap_data.h"]
     settings = "os", "arch", "compiler", "build_type"
     options = {"shared": [True, False],
                "fPIC": [True, False],
                "data_packaging": ["files", "archive", "library", "static"],
                "with_unit_tests": [True, False],
-               "silent": [True, False]}
+               "silent": [True, False],
+               "data_filter": "ANY",
+               "data_filter_file": "ANY"}
     default_options = {"shared": False,
                        "fPIC": True,
                        "data_packaging": "archive",
                        "with_unit_tests": False,
-                       "silent": True}
+                       "silent": True,
+                       "data_filter": None,
+                       "data_filter_file": None}
 
     @property
     def _the_os(self):
@@ -45,10 +53,41 @@ class ICUBase(ConanFile):
     def _is_mingw(self):
         return self._the_os == "Windows" and self.settings.compiler == "gcc"
 
+    @property
+    def _has_data_filter(self):
+        return bool(self.options.data_filter or self.options.data_filter_file)
+
+    @property
+    def _data_filter(self):
+        # data_filter_file is the absolute path to an ICU data filter file and
+        # data_filter a comma separated list of locales, e.g. "en,de,fr_CA"
+        if self.options.data_filter_file:
+            return tools.load(str(self.options.data_filter_file))
+        locales = [locale.strip() for locale in str(self.options.data_filter).split(",") if locale.strip()]
+        # The "locale" filter type appeared in ICU 65 and "whitelist" was renamed
+        # to "includelist" in ICU 68
+        version = tools.Version(self.version)
+        filter_type = "language" if version < "65" else "locale"
+        include_key = "whitelist" if version < "68" else "includelist"
+        return json.dumps({"localeFilter": {"filterType": filter_type,
+                                            include_key: locales}}, indent=2)
+
     def build_requirements(self):
         if self._the_os == "Windows":
             self.build_requires("msys2/20161025")
 
+    def configure(self):
+        if self.options.data_filter and self.options.data_filter_file:
+            raise ConanInvalidConfiguration("icu:data_filter and icu:data_filter_file cannot be used together")
+        if self.options.data_filter_file:
+            data_filter_file = str(self.options.data_filter_file)
+            # a relative path would resolve differently in package_id() and build()
+            if not os.path.isabs(data_filter_file):
+                raise ConanInvalidConfiguration("icu:data_filter_file must be an absolute path, got '%s'"
+                                                % data_filter_file)
+            if not os.path.isfile(data_filter_file):
+                raise ConanInvalidConfiguration("icu:data_filter_file '%s' does not exist" % data_filter_file)
+
     def source(self):
         tools.get(**self.conan_data["sources"][self.version])
         os.rename("icu", self._source_subfolder)
@@ -64,6 +103,27 @@ class ICUBase(ConanFile):
                                   'PYTHONPATH="$srcdir/test/testdata:$srcdir/data"',
                                   'PYTHONPATH="%s\\test\\testdata;%s\\data"' % (srcdir, srcdir))
 
+    def _use_data_sources(self):
+        # The -src archive only ships the prebuilt icudt*.dat, which filters cannot
+        # be applied to: replace it with the data sources so the data is rebuilt.
+        # Downloaded here, as only filtered builds need them
+        data_dir = os.path.join(self._source_subfolder, "source", "data")
+        shutil.rmtree(data_dir)
+        tools.get(**self.conan_data["sources"]["{}_data".format(self.version)])
+        shutil.move("data", data_dir)
+
+    def _check_python3(self):
+        # the filtered data is built by the Python 3 data build tool of ICU
+        for python in ["python3", "python"]:
+            if tools.which(python):
+                try:
+                    self.run('%s -c "import sys; sys.exit(sys.version_info[0] < 3)"' % python)
+                    return
+                except ConanException:
+                    pass
+        raise ConanException("icu:data_filter and icu:data_filter_file need Python 3 in the PATH "
+                             "to build the filtered ICU data")
+
     def _workaround_icu_20545(self):
         if tools.os_info.is_windows:
             # https://unicode-org.atlassian.net/projects/ICU/issues/ICU-20545
@@ -90,6 +150,15 @@ class ICUBase(ConanFile):
         self._replace_pythonpath() # ICU 64.1
         self._workaround_icu_20545()
 
+        env_data_filter = {}
+        if self._has_data_filter:
+            self._check_python3()
+            self._use_data_sources()
+            filter_file = os.path.join(self.build_folder, "icu_data_filter.json")
+            tools.save(filter_file, self._data_filter)
+            self.output.info("ICU data filter:\n%s" % self._data_filter)
+            env_data_filter["ICU_DATA_FILTER_FILE"] = filter_file
+
         self._env_build = AutoToolsBuildEnvironment(self)
         if not self.options.get_safe("shared"):
             self._env_build.defines.append("U_STATIC_IMPLEMENTATION")
@@ -108,7 +177,8 @@ class ICUBase(ConanFile):
                     # workaround for https://unicode-org.atlassian.net/browse/ICU-20531
                     os.makedirs(os.path.join("data", "out", "tmp"))
 
-                    self.run(self._build_config_cmd, win_bash=tools.os_info.is_windows)
+                    with tools.environment_append(env_data_filter):
+                        self.run(self._build_config_cmd, win_bash=tools.os_info.is_windows)
                     if self.options.get_safe("silent"):
                         silent = '--silent' if self.options.silent else 'VERBOSE=1'
                     else:
@@ -133,6 +203,15 @@ class ICUBase(ConanFile):
         tools.rmdir(os.path.join(self.package_folder, "lib", "pkgconfig"))
         tools.rmdir(os.path.join(self.package_folder, "share"))
 
+        if self.options.get_safe("data_packaging") == "archive":
+            # Publish the data archive in res/ so it can be located from package_info()
+            # and memory-mapped by consumers with icu_mmap_data.h
+            res_dir = os.path.join(self.package_folder, "res")
+            tools.mkdir(res_dir)
+            for dat in glob.glob(os.path.join(self.package_folder, "lib", "icu*", self.version, "icudt*.dat")):
+                shutil.move(dat, res_dir)
+            self.copy("icu_mmap_data.h", dst="include", src=self.source_folder)
+
     @staticmethod
     def detected_os():
         if tools.OSInfo().is_macos:
@@ -222,6 +301,10 @@ class ICUBase(ConanFile):
     def package_id(self):
         del self.info.options.with_unit_tests  # ICU unit testing shouldn't affect the package's ID
         del self.info.options.silent  # Verbosity doesn't affect package's ID
+        if self._has_data_filter:
+            # The filter content, not the path to a filter file, defines the data
+            self.info.options.data_filter = hashlib.sha256(self._data_filter.encode("utf-8")).hexdigest()
+        del self.info.options.data_filter_file
 
     def config_options(self):
         if self.settings.os == "Windows":
@@ -249,9 +332,14 @@ class ICUBase(ConanFile):
         data_dir = os.path.join(self.package_folder, 'lib', data_dir_name, self.version)
         vtag = self.version.split('.')[0]
         data_file = "icudt{v}l.dat".format(v=vtag)
-        data_path = os.path.join(data_dir, data_file).replace('\\', '/')
-        if self.options.get_safe("data_packaging") in ["files", "archive"]:
-            self.env_info.ICU_DATA.append(data_path)
+        if self.options.get_safe("data_packaging") == "archive":
+            # ICU_DATA is the directory ICU searches for the archive
+            res_dir = os.path.join(self.package_folder, "res")
+            self.env_info.ICU_DATA.append(res_dir.replace('\\', '/'))
+            self.user_info.data_dir = res_dir.replace('\\', '/')
+            self.user_info.data_file = os.path.join(res_dir, data_file).replace('\\', '/')
+        elif self.options.get_safe("data_packaging") == "files":
+            self.env_info.ICU_DATA.append(data_dir.replace('\\', '/'))
 
         if not self.options.shared:
             self.cpp_info.defines.append("U_STATIC_IMPLEMENTATION")
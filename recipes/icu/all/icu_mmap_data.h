@@ -0,0 +1,79 @@
+/*
+ * Loads the ICU common data from an icudt*.dat archive mapped into memory.
+ *
+ * Shipped by the Conan icu package built with data_packaging=archive. The
+ * archive is in the package res/ folder and its path is published as
+ * user_info.data_file. Mapping the file read-only lets every process on a host
+ * share the same page-cached copy of the data.
+ *
+ *     UErrorCode status = U_ZERO_ERROR;
+ *     icu_mmap_data_load("/path/to/icudt64l.dat", &status);
+ *
+ * Call it once, before any other ICU function. The mapping is never released
+ * because ICU keeps pointers into it until u_cleanup().
+ */
+
+#ifndef CONAN_ICU_MMAP_DATA_H
+#define CONAN_ICU_MMAP_DATA_H
+
+#include "unicode/udata.h"
+#include "unicode/utypes.h"
+
+#ifdef _WIN32
+#ifndef WIN32_LEAN_AND_MEAN
+#define WIN32_LEAN_AND_MEAN
+#endif
+#include <windows.h>
+#else
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#endif
+
+static const void* icu_mmap_data_map(const char* path)
+{
+#ifdef _WIN32
+    const void* data = NULL;
+    HANDLE mapping;
+    HANDLE const file = CreateFileA(path, GENERIC_READ, FILE_SHARE_READ, NULL, OPEN_EXISTING,
+                                    FILE_ATTRIBUTE_NORMAL, NULL);
+    if (file == INVALID_HANDLE_VALUE)
+        return NULL;
+    mapping = CreateFileMappingA(file, NULL, PAGE_READONLY, 0, 0, NULL);
+    CloseHandle(file);
+    if (mapping == NULL)
+        return NULL;
+    data = MapViewOfFile(mapping, FILE_MAP_READ, 0, 0, 0);
+    CloseHandle(mapping);
+    return data;
+#else
+    void* data;
+    struct stat st;
+    int const fd = open(path, O_RDONLY);
+    if (fd < 0)
+        return NULL;
+    if (fstat(fd, &st) != 0 || st.st_size == 0) {
+        close(fd);
+        return NULL;
+    }
+    data = mmap(NULL, (size_t)st.st_size, PROT_READ, MAP_SHARED, fd, 0);
+    close(fd);
+    return data == MAP_FAILED ? NULL : data;
+#endif
+}
+
+static void icu_mmap_data_load(const char* path, UErrorCode* status)
+{
+    const void* data;
+    if (status == NULL || U_FAILURE(*status))
+        return;
+    data = icu_mmap_data_map(path);
+    if (data == NULL) {
+        *status = U_FILE_ACCESS_ERROR;
+        return;
+    }
+    udata_setCommonData(data, status);
+}
+
+#endif
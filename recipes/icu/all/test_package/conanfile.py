@@ -15,3 +15,6 @@ class ICUTestConan(ConanFile):
         if not tools.cross_building(self.settings):
             bin_path = os.path.join("bin", "test_package")
             self.run(bin_path, run_environment=True)
+            if self.options["icu"].data_packaging == "archive":
+                bin_path = os.path.join("bin", "test_mmap_data")
+                self.run("%s %s" % (bin_path, self.deps_user_info["icu"].data_file), run_environment=True)
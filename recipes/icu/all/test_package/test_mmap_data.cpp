@@ -0,0 +1,25 @@
+#include <stdio.h>
+#include <string>
+#include "icu_mmap_data.h"
+#include "unicode/locid.h"
+#include "unicode/unistr.h"
+
+int main(int argc, const char *argv[]) {
+    if (argc < 2) {
+        fprintf(stderr, "usage: test_mmap_data <icudt*.dat>\n");
+        return 1;
+    }
+    UErrorCode errorCode = U_ZERO_ERROR;
+    icu_mmap_data_load(argv[1], &errorCode);
+    if (U_FAILURE(errorCode)) {
+        fprintf(stderr, "error %s mapping %s\n", u_errorName(errorCode), argv[1]);
+        return 1;
+    }
+
+    // Case mapping with a locale reads the data from the mapped archive
+    icu::UnicodeString s("istanbul");
+    std::string upper;
+    s.toUpper(icu::Locale("tr")).toUTF8String(upper);
+    printf("ICU data mapped from %s: %s\n", argv[1], upper.c_str());
+    return 0;
+}
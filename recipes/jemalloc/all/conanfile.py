@@ -0,0 +1,62 @@
+from conans import ConanFile, AutoToolsBuildEnvironment, tools
+from conans.errors import ConanInvalidConfiguration
+import os
+
+
+class JemallocConan(ConanFile):
+    name = "jemalloc"
+    description = "jemalloc is a general purpose malloc(3) implementation that emphasizes fragmentation avoidance and scalable concurrency support"
+    topics = ("conan", "jemalloc", "malloc", "allocator", "memory")
+    url = "https://github.com/conan-io/conan-center-index"
+    homepage = "http://jemalloc.net"
+    license = "BSD-2-Clause"
+    settings = "os", "arch", "compiler", "build_type"
+    options = {"shared": [True, False], "fPIC": [True, False]}
+    default_options = {"shared": False, "fPIC": True}
+
+    _source_subfolder = "source_subfolder"
+    _autotools = None
+
+    def config_options(self):
+        if self.settings.os == "Windows":
+            del self.options.fPIC
+
+    def configure(self):
+        del self.settings.compiler.libcxx
+        del self.settings.compiler.cppstd
+        if self.settings.compiler == "Visual Studio":
+            raise ConanInvalidConfiguration("jemalloc is not supported by Visual Studio")
+
+    def source(self):
+        tools.get(**self.conan_data["sources"][self.version])
+        os.rename("jemalloc-{}".format(self.version), self._source_subfolder)
+
+    def _configure_autotools(self):
+        if not self._autotools:
+            self._autotools = AutoToolsBuildEnvironment(self, win_bash=tools.os_info.is_windows)
+            # the C++ operator new/delete replacements would pull in the C++ runtime
+            args = ["--disable-cxx"]
+            if self.options.shared:
+                args.extend(["--enable-shared", "--disable-static"])
+            else:
+                args.extend(["--disable-shared", "--enable-static"])
+            if self.settings.build_type == "Debug":
+                args.append("--enable-debug")
+            self._autotools.configure(configure_dir=self._source_subfolder, args=args)
+        return self._autotools
+
+    def build(self):
+        autotools = self._configure_autotools()
+        autotools.make()
+
+    def package(self):
+        self.copy(pattern="COPYING", dst="licenses", src=self._source_subfolder)
+        autotools = self._configure_autotools()
+        # the install target also installs the manual, which needs xsltproc to build
+        autotools.make(target="install_include install_lib")
+        tools.rmdir(os.path.join(self.package_folder, "lib", "pkgconfig"))
+
+    def package_info(self):
+        self.cpp_info.libs = ["jemalloc"]
+        if self.settings.os == "Linux":
+            self.cpp_info.system_libs.extend(["pthread", "dl"])
@@ -0,0 +1,23 @@
+#include <stdio.h>
+#include <stdlib.h>
+/* the symbols are prefixed with je_ on macOS and Windows, use the unprefixed names everywhere */
+#define JEMALLOC_MANGLE
+#include <jemalloc/jemalloc.h>
+
+int main()
+{
+    const char* version;
+    size_t size = sizeof(version);
+    void* ptr;
+
+    if (mallctl("version", &version, &size, NULL, 0) != 0) {
+        fprintf(stderr, "mallctl(\"version\") failed\n");
+        return EXIT_FAILURE;
+    }
+    ptr = mallocx(1000, 0);
+    if (ptr == NULL)
+        return EXIT_FAILURE;
+    printf("jemalloc %s, size class of a 1000 byte allocation: %lu\n", version, (unsigned long)sallocx(ptr, 0));
+    dallocx(ptr, 0);
+    return EXIT_SUCCESS;
+}
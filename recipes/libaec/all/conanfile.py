@@ -0,0 +1,76 @@
+import glob
+import os
+
+from conans import CMake, ConanFile, tools
+
+
+class LibaecConan(ConanFile):
+    name = "libaec"
+    description = "Adaptive Entropy Coding library, with a drop-in replacement of the SZIP library"
+    topics = ("conan", "libaec", "szip", "compression", "decompression")
+    url = "https://github.com/conan-io/conan-center-index"
+    homepage = "https://gitlab.dkrz.de/k202009/libaec"
+    license = "BSD-2-Clause"
+    exports_sources = ["CMakeLists.txt"]
+    generators = "cmake"
+
+    settings = "os", "arch", "compiler", "build_type"
+    options = {
+        "shared": [True, False],
+        "fPIC": [True, False]
+    }
+    default_options = {
+        "shared": False,
+        "fPIC": True
+    }
+
+    _source_subfolder = "source_subfolder"
+    _build_subfolder = "build_subfolder"
+
+    def config_options(self):
+        if self.settings.os == "Windows":
+            del self.options.fPIC
+
+    def configure(self):
+        del self.settings.compiler.libcxx
+        del self.settings.compiler.cppstd
+
+    def source(self):
+        tools.get(**self.conan_data["sources"][self.version])
+        extracted_dir = self.name + "-v" + self.version
+        os.rename(extracted_dir, self._source_subfolder)
+
+    def _configure_cmake(self):
+        cmake = CMake(self)
+        cmake.definitions["BUILD_TESTING"] = False
+        cmake.configure(build_folder=self._build_subfolder)
+        return cmake
+
+    def build(self):
+        cmake = self._configure_cmake()
+        cmake.build()
+
+    def package(self):
+        self.copy("Copyright.txt", src=self._source_subfolder, dst="licenses")
+        cmake = self._configure_cmake()
+        cmake.install()
+        tools.rmdir(os.path.join(self.package_folder, "cmake"))
+        tools.rmdir(os.path.join(self.package_folder, "lib", "cmake"))
+        tools.rmdir(os.path.join(self.package_folder, "share"))
+        self._remove_other_library_kind()
+
+    def _remove_other_library_kind(self):
+        # libaec always builds and installs both the shared and the static libraries
+        lib_folder = os.path.join(self.package_folder, "lib")
+        if self.options.shared:
+            patterns = [os.path.join(lib_folder, "*.a")]
+        else:
+            patterns = [os.path.join(lib_folder, "*.so*"), os.path.join(lib_folder, "*.dylib"),
+                        os.path.join(self.package_folder, "bin", "*.dll")]
+        for pattern in patterns:
+            for library in glob.glob(pattern):
+                os.remove(library)
+
+    def package_info(self):
+        # libsz is the SZIP compatibility layer on top of libaec
+        self.cpp_info.libs = ["sz", "aec"]
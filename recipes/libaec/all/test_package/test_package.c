@@ -0,0 +1,35 @@
+#include <stdio.h>
+#include <string.h>
+#include <szlib.h>
+
+#define N_SAMPLES 4096
+
+int main(void)
+{
+    unsigned short source[N_SAMPLES], decoded[N_SAMPLES];
+    unsigned char compressed[2 * sizeof(source)];
+    size_t compressed_size = sizeof(compressed);
+    size_t decoded_size = sizeof(decoded);
+    SZ_com_t params;
+    int i;
+
+    for (i = 0; i < N_SAMPLES; ++i)
+        source[i] = (unsigned short)(1000 + (i % 64));
+
+    params.options_mask = SZ_ALLOW_K13_OPTION_MASK | SZ_LSB_OPTION_MASK | SZ_NN_OPTION_MASK;
+    params.bits_per_pixel = 16;
+    params.pixels_per_block = 32;
+    params.pixels_per_scanline = 256;
+
+    if (SZ_BufftoBuffCompress(compressed, &compressed_size, source, sizeof(source), &params) != SZ_OK) {
+        fprintf(stderr, "SZ_BufftoBuffCompress failed\n");
+        return 1;
+    }
+    if (SZ_BufftoBuffDecompress(decoded, &decoded_size, compressed, compressed_size, &params) != SZ_OK ||
+        decoded_size != sizeof(source) || memcmp(source, decoded, sizeof(source)) != 0) {
+        fprintf(stderr, "SZ_BufftoBuffDecompress round trip failed\n");
+        return 1;
+    }
+    printf("szip round trip: %u -> %u bytes\n", (unsigned)sizeof(source), (unsigned)compressed_size);
+    return 0;
+}
@@ -30,7 +30,10 @@ class LibcurlConan(ConanFile):
                "with_libpsl": [True, False],
                "with_largemaxwritesize": [True, False],
                "with_nghttp2": [True, False],
-               "with_brotli": [True, False]}
+               "with_brotli": [True, False],
+               "with_zstd": [True, False],
+               "with_c_ares": [True, False],
+               "threaded_resolver": [True, False]}
     default_options = {'shared': False,
                        'fPIC': True,
                        'with_openssl': True,
@@ -44,13 +47,21 @@ class LibcurlConan(ConanFile):
                        'with_libpsl': False,
                        'with_largemaxwritesize': False,
                        'with_nghttp2': False,
-                       'with_brotli': False
+                       'with_brotli': False,
+                       'with_zstd': False,
+                       'with_c_ares': False,
+                       'threaded_resolver': True
                        }
 
     _source_subfolder = "source_subfolder"
     _build_subfolder = "build_subfolder"
     _autotools = False
 
+    @property
+    def _has_zstd_support(self):
+        # zstd Content-Encoding was added in curl 7.72.0
+        return tools.Version(self.version) >= "7.72.0"
+
     @property
     def _is_mingw(self):
         return self.settings.os == "Windows" and self.settings.compiler != "Visual Studio"
@@ -98,6 +109,16 @@ class LibcurlConan(ConanFile):
             if self.settings.compiler != "Visual Studio":
                 self.options["libssh2"].shared = self.options.shared
 
+        if self.options.with_zstd and not self._has_zstd_support:
+            raise ConanInvalidConfiguration("with_zstd requires libcurl >= 7.72.0")
+        if self.options.with_zstd and self.settings.compiler == "Visual Studio":
+            # curl's CMake build, used for Visual Studio, has no zstd detection
+            raise ConanInvalidConfiguration("with_zstd is not supported with Visual Studio")
+
+        # c-ares and the threaded resolver are mutually exclusive in curl
+        if self.options.with_c_ares:
+            del self.options.threaded_resolver
+
     def system_requirements(self):
         # TODO: Declare tools needed to compile. The idea is Conan checking that they are
         #   installed and providing a meaninful message before starting the compilation. It
@@ -117,6 +138,10 @@ class LibcurlConan(ConanFile):
                 self.requires.add("libssh2/1.9.0")
         if self.options.with_nghttp2:
             self.requires.add("libnghttp2/1.40.0")
+        if self.options.with_c_ares:
+            self.requires.add("c-ares/1.15.0")
+        if self.options.with_zstd:
+            self.requires.add("zstd/1.4.3")
 
         self.requires.add("zlib/1.2.11")
 
@@ -152,6 +177,11 @@ class LibcurlConan(ConanFile):
         params.append("--without-libmetalink" if not self.options.with_libmetalink else "--with-libmetalink")
         params.append("--without-libpsl" if not self.options.with_libpsl else "--with-libpsl")
         params.append("--without-brotli" if not self.options.with_brotli else "--with-brotli")
+        if self._has_zstd_support:
+            if self.options.with_zstd:
+                params.append("--with-zstd=%s" % self.deps_cpp_info["zstd"].rootpath.replace('\\', '/'))
+            else:
+                params.append("--without-zstd")
 
         if self.settings.os == "Macos" and self.options.darwin_ssl:
             params.append("--with-darwinssl")
@@ -177,6 +207,12 @@ class LibcurlConan(ConanFile):
 
         params.append("--with-zlib=%s" % self.deps_cpp_info["zlib"].lib_paths[0].replace('\\', '/'))
 
+        if self.options.with_c_ares:
+            params.append("--enable-ares=%s" % self.deps_cpp_info["c-ares"].rootpath.replace('\\', '/'))
+        else:
+            params.append("--disable-ares")
+        params.append("--enable-threaded-resolver" if self.options.get_safe("threaded_resolver") else "--disable-threaded-resolver")
+
         if not self.options.shared:
             params.append("--disable-shared")
             params.append("--enable-static")
@@ -318,6 +354,8 @@ class LibcurlConan(ConanFile):
         cmake.definitions['CURL_STATICLIB'] = not self.options.shared
         cmake.definitions['CMAKE_DEBUG_POSTFIX'] = ''
         cmake.definitions['CMAKE_USE_LIBSSH2'] = self.options.with_libssh2
+        cmake.definitions['ENABLE_ARES'] = self.options.with_c_ares
+        cmake.definitions['ENABLE_THREADED_RESOLVER'] = bool(self.options.get_safe("threaded_resolver"))
 
         # all these options are exclusive. set just one of them
         # mac builds do not use cmake so don't even bother about darwin_ssl
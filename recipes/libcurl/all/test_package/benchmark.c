@@ -0,0 +1,416 @@
+/*
+ * Request rate and connection reuse benchmark for the packaged libcurl.
+ *
+ * Usage: benchmark <requests> <parallel transfers> <output json>
+ *
+ * A small HTTP server runs in a second thread on the loopback interface and
+ * answers every GET with a fixed 1 KiB body. The client drives a pool of easy
+ * handles through the multi interface, re-adding each handle as soon as its
+ * transfer completes, so the connection cache decides how many connections
+ * are opened. HTTP/2 (prior knowledge, multiplexed) is measured when libcurl
+ * was built with nghttp2.
+ */
+
+#include <curl/curl.h>
+
+#include <arpa/inet.h>
+#include <netinet/in.h>
+#include <netinet/tcp.h>
+#include <poll.h>
+#include <pthread.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <sys/socket.h>
+#include <time.h>
+#include <unistd.h>
+
+#ifdef BENCHMARK_HTTP2
+#include <nghttp2/nghttp2.h>
+#endif
+
+#ifndef MSG_NOSIGNAL
+#define MSG_NOSIGNAL 0
+#endif
+
+#define BODY_SIZE 1024
+#define MAX_CLIENTS 256
+#define READ_BUFFER_SIZE 16384
+
+typedef struct {
+    int fd;
+    size_t len;
+    char buffer[READ_BUFFER_SIZE];
+#ifdef BENCHMARK_HTTP2
+    nghttp2_session* session;
+#endif
+} connection;
+
+typedef struct {
+    int listen_fd;
+    int http2;
+    int port;
+    volatile int stop;
+    unsigned long accepted;
+    connection clients[MAX_CLIENTS];
+} server;
+
+static char body[BODY_SIZE];
+
+
+static double now_seconds(void)
+{
+    struct timespec ts;
+    timespec_get(&ts, TIME_UTC);
+    return (double)ts.tv_sec + (double)ts.tv_nsec / 1e9;
+}
+
+static int send_all(int fd, const void* data, size_t size)
+{
+    const char* p = (const char*)data;
+    while (size > 0) {
+        ssize_t const sent = send(fd, p, size, MSG_NOSIGNAL);
+        if (sent <= 0) return -1;
+        p += sent;
+        size -= (size_t)sent;
+    }
+    return 0;
+}
+
+/* HTTP/1.1: answer every complete request header block in the buffer */
+static int http1_serve(connection* c)
+{
+    static char response[256 + BODY_SIZE];
+    static size_t responseSize = 0;
+    char* end;
+
+    if (responseSize == 0) {
+        responseSize = (size_t)sprintf(response, "HTTP/1.1 200 OK\r\nContent-Type: application/octet-stream\r\n"
+                                                 "Content-Length: %d\r\n\r\n", BODY_SIZE);
+        memcpy(response + responseSize, body, BODY_SIZE);
+        responseSize += BODY_SIZE;
+    }
+    while ((end = strstr(c->buffer, "\r\n\r\n")) != NULL) {
+        size_t const consumed = (size_t)(end + 4 - c->buffer);
+        if (send_all(c->fd, response, responseSize) != 0) return -1;
+        memmove(c->buffer, c->buffer + consumed, c->len - consumed + 1);
+        c->len -= consumed;
+    }
+    return 0;
+}
+
+#ifdef BENCHMARK_HTTP2
+static ssize_t h2_read_body(nghttp2_session* session, int32_t stream_id, uint8_t* buf, size_t length,
+                            uint32_t* data_flags, nghttp2_data_source* source, void* user_data)
+{
+    size_t* const remaining = (size_t*)nghttp2_session_get_stream_user_data(session, stream_id);
+    size_t const n = length < *remaining ? length : *remaining;
+    (void)source; (void)user_data;
+    memcpy(buf, body + (BODY_SIZE - *remaining), n);
+    *remaining -= n;
+    if (*remaining == 0) *data_flags |= NGHTTP2_DATA_FLAG_EOF;
+    return (ssize_t)n;
+}
+
+static int h2_on_frame_recv(nghttp2_session* session, const nghttp2_frame* frame, void* user_data)
+{
+    (void)user_data;
+    if ((frame->hd.type == NGHTTP2_HEADERS || frame->hd.type == NGHTTP2_DATA) &&
+        (frame->hd.flags & NGHTTP2_FLAG_END_STREAM) && frame->hd.stream_id != 0) {
+        static const nghttp2_nv headers[] = {
+            { (uint8_t*)":status", (uint8_t*)"200", 7, 3, NGHTTP2_NV_FLAG_NONE },
+            { (uint8_t*)"content-type", (uint8_t*)"application/octet-stream", 12, 24, NGHTTP2_NV_FLAG_NONE },
+        };
+        nghttp2_data_provider provider;
+        size_t* const remaining = (size_t*)malloc(sizeof(size_t));
+        if (remaining == NULL) return NGHTTP2_ERR_CALLBACK_FAILURE;
+        *remaining = BODY_SIZE;
+        nghttp2_session_set_stream_user_data(session, frame->hd.stream_id, remaining);
+        provider.source.ptr = NULL;
+        provider.read_callback = h2_read_body;
+        if (nghttp2_submit_response(session, frame->hd.stream_id, headers, 2, &provider) != 0)
+            return NGHTTP2_ERR_CALLBACK_FAILURE;
+    }
+    return 0;
+}
+
+static int h2_on_stream_close(nghttp2_session* session, int32_t stream_id, uint32_t error_code, void* user_data)
+{
+    (void)error_code; (void)user_data;
+    free(nghttp2_session_get_stream_user_data(session, stream_id));
+    return 0;
+}
+
+static int h2_open(connection* c)
+{
+    nghttp2_session_callbacks* callbacks;
+    nghttp2_settings_entry settings = { NGHTTP2_SETTINGS_MAX_CONCURRENT_STREAMS, 1000 };
+    int ret;
+    nghttp2_session_callbacks_new(&callbacks);
+    nghttp2_session_callbacks_set_on_frame_recv_callback(callbacks, h2_on_frame_recv);
+    nghttp2_session_callbacks_set_on_stream_close_callback(callbacks, h2_on_stream_close);
+    ret = nghttp2_session_server_new(&c->session, callbacks, c);
+    nghttp2_session_callbacks_del(callbacks);
+    if (ret != 0) return -1;
+    return nghttp2_submit_settings(c->session, NGHTTP2_FLAG_NONE, &settings, 1) == 0 ? 0 : -1;
+}
+
+static int h2_flush(connection* c)
+{
+    for (;;) {
+        const uint8_t* data;
+        ssize_t const size = nghttp2_session_mem_send(c->session, &data);
+        if (size < 0) return -1;
+        if (size == 0) return 0;
+        if (send_all(c->fd, data, (size_t)size) != 0) return -1;
+    }
+}
+
+static int http2_serve(connection* c)
+{
+    ssize_t const used = nghttp2_session_mem_recv(c->session, (const uint8_t*)c->buffer, c->len);
+    c->len = 0;
+    if (used < 0) return -1;
+    return h2_flush(c);
+}
+#endif
+
+static void close_client(connection* c)
+{
+#ifdef BENCHMARK_HTTP2
+    if (c->session != NULL) nghttp2_session_del(c->session);
+    c->session = NULL;
+#endif
+    close(c->fd);
+    c->fd = -1;
+}
+
+static void* server_main(void* arg)
+{
+    server* const s = (server*)arg;
+    struct pollfd fds[MAX_CLIENTS + 1];
+    int i;
+
+    for (i = 0; i < MAX_CLIENTS; ++i) s->clients[i].fd = -1;
+    while (!s->stop) {
+        int nfds = 1;
+        int slots[MAX_CLIENTS + 1];
+        fds[0].fd = s->listen_fd;
+        fds[0].events = POLLIN;
+        for (i = 0; i < MAX_CLIENTS; ++i) {
+            if (s->clients[i].fd < 0) continue;
+            fds[nfds].fd = s->clients[i].fd;
+            fds[nfds].events = POLLIN;
+            slots[nfds++] = i;
+        }
+        if (poll(fds, (nfds_t)nfds, 100) <= 0) continue;
+
+        if (fds[0].revents & POLLIN) {
+            int const fd = accept(s->listen_fd, NULL, NULL);
+            int const one = 1;
+            for (i = 0; fd >= 0 && i < MAX_CLIENTS && s->clients[i].fd >= 0; ++i) {}
+            if (fd >= 0 && i == MAX_CLIENTS) {
+                close(fd);
+            } else if (fd >= 0) {
+                connection* const c = &s->clients[i];
+                setsockopt(fd, IPPROTO_TCP, TCP_NODELAY, &one, sizeof(one));
+                c->fd = fd;
+                c->len = 0;
+                ++s->accepted;
+#ifdef BENCHMARK_HTTP2
+                c->session = NULL;
+                if (s->http2 && (h2_open(c) != 0 || h2_flush(c) != 0)) close_client(c);
+#endif
+            }
+        }
+        for (i = 1; i < nfds; ++i) {
+            connection* const c = &s->clients[slots[i]];
+            ssize_t received;
+            int failed;
+            if (!(fds[i].revents & (POLLIN | POLLHUP | POLLERR))) continue;
+            received = recv(c->fd, c->buffer + c->len, sizeof(c->buffer) - c->len - 1, 0);
+            if (received <= 0) { close_client(c); continue; }
+            c->len += (size_t)received;
+            c->buffer[c->len] = '\0';
+#ifdef BENCHMARK_HTTP2
+            failed = s->http2 ? http2_serve(c) : http1_serve(c);
+#else
+            failed = http1_serve(c);
+#endif
+            if (failed || c->len == sizeof(c->buffer) - 1) close_client(c);
+        }
+    }
+    for (i = 0; i < MAX_CLIENTS; ++i) {
+        if (s->clients[i].fd >= 0) close_client(&s->clients[i]);
+    }
+    return NULL;
+}
+
+static int server_start(server* s, int http2, pthread_t* thread)
+{
+    struct sockaddr_in addr;
+    socklen_t addrLen = sizeof(addr);
+    int const one = 1;
+
+    memset(s, 0, sizeof(*s));
+    s->http2 = http2;
+    s->listen_fd = socket(AF_INET, SOCK_STREAM, 0);
+    if (s->listen_fd < 0) return -1;
+    setsockopt(s->listen_fd, SOL_SOCKET, SO_REUSEADDR, &one, sizeof(one));
+    memset(&addr, 0, sizeof(addr));
+    addr.sin_family = AF_INET;
+    addr.sin_addr.s_addr = htonl(INADDR_LOOPBACK);
+    addr.sin_port = 0;
+    if (bind(s->listen_fd, (struct sockaddr*)&addr, sizeof(addr)) != 0 ||
+        listen(s->listen_fd, 128) != 0 ||
+        getsockname(s->listen_fd, (struct sockaddr*)&addr, &addrLen) != 0) {
+        close(s->listen_fd);
+        return -1;
+    }
+    s->port = ntohs(addr.sin_port);
+    return pthread_create(thread, NULL, server_main, s);
+}
+
+static size_t discard(char* ptr, size_t size, size_t nmemb, void* userdata)
+{
+    (void)ptr; (void)userdata;
+    return size * nmemb;
+}
+
+typedef struct {
+    const char* name;
+    int http2;
+    int forbidReuse;
+} workload;
+
+static int run_workload(const workload* w, long requests, long parallel, FILE* out, int* first)
+{
+    static server s;   /* too large for the stack */
+    pthread_t thread;
+    CURLM* multi;
+    CURL** handles;
+    char url[64];
+    long started = 0, completed = 0, failed = 0, newConnections = 0;
+    long i;
+    int running = 0;
+    double start, seconds;
+
+    if (server_start(&s, w->http2, &thread) != 0) {
+        fprintf(stderr, "%s: failed to start the loopback server\n", w->name);
+        return -1;
+    }
+    sprintf(url, "http://127.0.0.1:%d/item", s.port);
+
+    multi = curl_multi_init();
+    handles = (CURL**)calloc((size_t)parallel, sizeof(CURL*));
+    if (multi == NULL || handles == NULL) return -1;
+    curl_multi_setopt(multi, CURLMOPT_MAX_HOST_CONNECTIONS, parallel);
+    curl_multi_setopt(multi, CURLMOPT_PIPELINING, w->http2 ? CURLPIPE_MULTIPLEX : CURLPIPE_NOTHING);
+
+    for (i = 0; i < parallel; ++i) {
+        CURL* const h = curl_easy_init();
+        curl_easy_setopt(h, CURLOPT_URL, url);
+        curl_easy_setopt(h, CURLOPT_WRITEFUNCTION, discard);
+        curl_easy_setopt(h, CURLOPT_NOSIGNAL, 1L);
+        curl_easy_setopt(h, CURLOPT_FORBID_REUSE, (long)w->forbidReuse);
+        if (w->http2) {
+            curl_easy_setopt(h, CURLOPT_HTTP_VERSION, (long)CURL_HTTP_VERSION_2_PRIOR_KNOWLEDGE);
+            curl_easy_setopt(h, CURLOPT_PIPEWAIT, 1L);
+        } else {
+            curl_easy_setopt(h, CURLOPT_HTTP_VERSION, (long)CURL_HTTP_VERSION_1_1);
+        }
+        handles[i] = h;
+    }
+
+    start = now_seconds();
+    for (i = 0; i < parallel && started < requests; ++i, ++started)
+        curl_multi_add_handle(multi, handles[i]);
+    do {
+        CURLMsg* msg;
+        int queued;
+        curl_multi_perform(multi, &running);
+        while ((msg = curl_multi_info_read(multi, &queued)) != NULL) {
+            long connects = 0;
+            if (msg->msg != CURLMSG_DONE) continue;
+            if (msg->data.result != CURLE_OK) ++failed;
+            curl_easy_getinfo(msg->easy_handle, CURLINFO_NUM_CONNECTS, &connects);
+            newConnections += connects;
+            ++completed;
+            curl_multi_remove_handle(multi, msg->easy_handle);
+            if (started < requests) {
+                curl_multi_add_handle(multi, msg->easy_handle);
+                ++started;
+            }
+        }
+        if (completed < requests)
+            curl_multi_wait(multi, NULL, 0, 100, NULL);
+    } while (completed < requests);
+    seconds = now_seconds() - start;
+
+    for (i = 0; i < parallel; ++i) curl_easy_cleanup(handles[i]);
+    free(handles);
+    curl_multi_cleanup(multi);
+    s.stop = 1;
+    pthread_join(thread, NULL);
+    close(s.listen_fd);
+
+    printf("%-18s %9.0f req/s, %ld new connections (%lu accepted), reuse %.2f%%, %ld failed\n",
+           w->name, requests / seconds, newConnections, s.accepted,
+           100.0 * (1.0 - (double)newConnections / requests), failed);
+    fprintf(out, "%s\n    {\"workload\": \"%s\", \"requests\": %ld, \"parallel\": %ld, \"requests_per_second\": %.1f, "
+                 "\"new_connections\": %ld, \"server_accepted\": %lu, \"reuse_ratio\": %.4f, \"failed\": %ld}",
+            *first ? "" : ",", w->name, requests, parallel, requests / seconds, newConnections, s.accepted,
+            1.0 - (double)newConnections / requests, failed);
+    *first = 0;
+    return failed == 0 ? 0 : -1;
+}
+
+int main(int argc, const char** argv)
+{
+    static const workload workloads[] = {
+        { "http1.1", 0, 0 },
+        { "http1.1_no_reuse", 0, 1 },
+        { "http2", 1, 0 },
+    };
+    long const requests = argc > 1 ? strtol(argv[1], NULL, 10) : 20000;
+    long const parallel = argc > 2 ? strtol(argv[2], NULL, 10) : 32;
+    const char* const outName = argc > 3 ? argv[3] : "libcurl_benchmark.json";
+    curl_version_info_data* const info = curl_version_info(CURLVERSION_NOW);
+    int const hasHttp2 = (info->features & CURL_VERSION_HTTP2) != 0;
+    FILE* out;
+    size_t w;
+    int first = 1;
+    int status = 0;
+
+    if (requests <= 0 || parallel <= 0 || parallel > MAX_CLIENTS) {
+        fprintf(stderr, "usage: benchmark <requests> <parallel transfers, 1-%d> <output json>\n", MAX_CLIENTS);
+        return 2;
+    }
+    memset(body, 'x', sizeof(body));
+    curl_global_init(CURL_GLOBAL_DEFAULT);
+    out = fopen(outName, "w");
+    if (out == NULL) { perror(outName); return 3; }
+    fprintf(out, "{\n  \"curl_version\": \"%s\",\n  \"results\": [", info->version);
+
+    for (w = 0; w < sizeof(workloads) / sizeof(workloads[0]); ++w) {
+#ifdef BENCHMARK_HTTP2
+        if (workloads[w].http2 && !hasHttp2) {
+            printf("%-18s skipped (libcurl built without HTTP/2)\n", workloads[w].name);
+            continue;
+        }
+#else
+        if (workloads[w].http2) {
+            printf("%-18s skipped (%s)\n", workloads[w].name,
+                   hasHttp2 ? "benchmark built without nghttp2" : "libcurl built without HTTP/2");
+            continue;
+        }
+#endif
+        if (run_workload(&workloads[w], requests, parallel, out, &first) != 0) status = 1;
+    }
+
+    fprintf(out, "\n  ]\n}\n");
+    fclose(out);
+    curl_global_cleanup();
+    printf("results written to %s\n", outName);
+    return status;
+}
@@ -10,6 +10,7 @@ class TestPackageConan(ConanFile):
 
     def build(self):
         cmake = CMake(self)
+        cmake.definitions["BUILD_BENCHMARK"] = tools.get_env("CONAN_LIBCURL_BENCHMARK", False)
         cmake.configure()
         cmake.build()
 
@@ -21,6 +22,14 @@ class TestPackageConan(ConanFile):
         else:
             bin_path = os.path.join("bin", "test_package")
             self.run(bin_path, run_environment=True)
+            # Opt-in loopback benchmark: CONAN_LIBCURL_BENCHMARK=1, load from
+            # CONAN_LIBCURL_BENCHMARK_REQUESTS and CONAN_LIBCURL_BENCHMARK_PARALLEL
+            if tools.get_env("CONAN_LIBCURL_BENCHMARK", False) and self.settings.os != "Windows":
+                requests = tools.get_env("CONAN_LIBCURL_BENCHMARK_REQUESTS", 20000)
+                parallel = tools.get_env("CONAN_LIBCURL_BENCHMARK_PARALLEL", 32)
+                results = os.path.join(self.build_folder, "libcurl_benchmark.json")
+                self.run("%s %s %s \"%s\"" % (os.path.join("bin", "benchmark"), requests, parallel, results),
+                         run_environment=True)
 
     def test_mingw_cross(self):
         bin_path = os.path.join("bin", "test_package.exe")
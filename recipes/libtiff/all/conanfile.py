@@ -1,4 +1,5 @@
 from conans import ConanFile, CMake, tools
+from conans.errors import ConanException, ConanInvalidConfiguration
 import os
 import shutil
 
@@ -13,8 +14,16 @@ class LibtiffConan(ConanFile):
     exports_sources = ["CMakeLists.txt"]
     generators = "cmake"
     settings = "os", "compiler", "build_type", "arch"
-    options = {"shared": [True, False], "fPIC": [True, False]}
-    default_options = {'shared': False, 'fPIC': True}
+    options = {"shared": [True, False], "fPIC": [True, False],
+               "lzma": [True, False],
+               "jpeg": [False, "libjpeg", "libjpeg-turbo"],
+               "zstd": [True, False],
+               "webp": [True, False]}
+    default_options = {'shared': False, 'fPIC': True,
+                       'lzma': False,
+                       'jpeg': False,
+                       'zstd': False,
+                       'webp': False}
     requires = "zlib/1.2.11"
 
     _source_subfolder = "source_subfolder"
@@ -25,6 +34,25 @@ class LibtiffConan(ConanFile):
         del self.settings.compiler.libcxx
         del self.settings.compiler.cppstd
 
+    def configure(self):
+        # ZSTD and WEBP compression schemes were added in libtiff 4.0.10
+        if tools.Version(self.version) < "4.0.10":
+            for codec in ["zstd", "webp"]:
+                if getattr(self.options, codec):
+                    raise ConanInvalidConfiguration("%s compression requires libtiff >= 4.0.10" % codec)
+
+    def requirements(self):
+        if self.options.lzma:
+            self.requires("xz_utils/5.2.4")
+        if self.options.jpeg == "libjpeg":
+            self.requires("libjpeg/9c")
+        elif self.options.jpeg == "libjpeg-turbo":
+            self.requires("libjpeg-turbo/2.0.2")
+        if self.options.zstd:
+            self.requires("zstd/1.4.3")
+        if self.options.webp:
+            self.requires("libwebp/1.0.3")
+
     def source(self):
         tools.get(**self.conan_data["sources"][self.version])
         os.rename('tiff-' + self.version, self._source_subfolder)
@@ -40,8 +68,13 @@ class LibtiffConan(ConanFile):
         cmake.definitions['CMAKE_INSTALL_BINDIR'] = 'bin'
         cmake.definitions['CMAKE_INSTALL_INCLUDEDIR'] = 'include'
 
-        cmake.definitions["lzma"] = False
-        cmake.definitions["jpeg"] = False
+        # Codec libraries are found through the include and library paths of the cmake generator
+        cmake.definitions["lzma"] = self.options.lzma
+        cmake.definitions["jpeg"] = bool(self.options.jpeg)
+        cmake.definitions["jpeg12"] = False
+        cmake.definitions["zstd"] = self.options.zstd
+        cmake.definitions["webp"] = self.options.webp
+        # JBIG-KIT is not packaged in the index
         cmake.definitions["jbig"] = False
         if self.options.shared and self.settings.compiler == "Visual Studio":
             # https://github.com/Microsoft/vcpkg/blob/master/ports/tiff/fix-cxx-shared-libs.patch
@@ -72,6 +105,17 @@ class LibtiffConan(ConanFile):
     def package(self):
         self.copy("COPYRIGHT", src=self._source_subfolder, dst="licenses", ignore_case=True, keep_path=False)
         tools.rmdir(os.path.join(self.package_folder, 'lib', 'pkgconfig'))
+        self._check_codecs()
+
+    def _check_codecs(self):
+        # libtiff silently drops a codec whose library it cannot find. lzma and jpeg are
+        # reported in the public tiffconf.h, zstd and webp only in the private tif_config.h
+        tiffconf = tools.load(os.path.join(self.package_folder, "include", "tiffconf.h"))
+        tif_config = tools.load(os.path.join(self.build_folder, "libtiff", "tif_config.h"))
+        for option, macro, config in [("lzma", "LZMA_SUPPORT", tiffconf), ("jpeg", "JPEG_SUPPORT", tiffconf),
+                                      ("zstd", "ZSTD_SUPPORT", tif_config), ("webp", "WEBP_SUPPORT", tif_config)]:
+            if getattr(self.options, option) and "#define %s 1" % macro not in config:
+                raise ConanException("%s was requested but libtiff was configured without it" % option)
 
     def package_info(self):
         self.cpp_info.libs = ["tiff", "tiffxx"]
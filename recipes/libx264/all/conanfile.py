@@ -1,5 +1,7 @@
 from conans import ConanFile, tools, AutoToolsBuildEnvironment
+from conans.errors import ConanException
 import os
+import re
 
 
 class LibX264Conan(ConanFile):
@@ -11,9 +13,20 @@ class LibX264Conan(ConanFile):
     topics = ("conan", "libx264", "video", "encoding")
     license = "GPL-2.0"
     settings = "os", "arch", "compiler", "build_type"
-    options = {"shared": [True, False], "fPIC": [True, False], "bit_depth": [8, 10, "all"]}
-    default_options = {'shared': False, 'fPIC': True, 'bit_depth': 'all'}
-    build_requires = "nasm/2.13.02"
+    options = {"shared": [True, False],
+               "fPIC": [True, False],
+               "bit_depth": [8, 10, "all"],
+               "asm": [True, False],
+               "threads": [True, False],
+               "lto": [True, False],
+               "opencl": [True, False]}
+    default_options = {'shared': False,
+                       'fPIC': True,
+                       'bit_depth': 'all',
+                       'asm': True,
+                       'threads': True,
+                       'lto': False,
+                       'opencl': True}
     _override_env = {}
     _autotools = None
 
@@ -29,7 +42,13 @@ class LibX264Conan(ConanFile):
     def _source_subfolder(self):
         return "source_subfolder"
 
+    @property
+    def _with_nasm(self):
+        return self.options.asm and self.settings.arch in ["x86", "x86_64"]
+
     def build_requirements(self):
+        if self._with_nasm:
+            self.build_requires("nasm/2.13.02")
         if "CONAN_BASH_PATH" not in os.environ and tools.os_info.is_windows:
             self.build_requires("msys2/20190524")
 
@@ -65,6 +84,14 @@ class LibX264Conan(ConanFile):
             if self.settings.build_type == 'Debug':
                 args.append('--enable-debug')
             args.append('--bit-depth=%s' % str(self.options.bit_depth))
+            if not self.options.asm:
+                args.append('--disable-asm')
+            if not self.options.threads:
+                args.append('--disable-thread')
+            if self.options.lto:
+                args.append('--enable-lto')
+            if not self.options.opencl:
+                args.append('--disable-opencl')
 
             if tools.cross_building(self.settings):
                 if self.settings.os == "Android":
@@ -87,8 +114,21 @@ class LibX264Conan(ConanFile):
                 # cannot open program database ... if multiple CL.EXE write to the same .PDB file, please use /FS
                 self._autotools.flags.append('-FS')
             self._autotools.configure(args=args, build=False, vars=self._override_env, configure_dir=self._source_subfolder)
+            self._check_asm()
         return self._autotools
 
+    def _check_asm(self):
+        # configure silently falls back to C code when the assembler checks fail
+        # on some architectures, which makes the encoder several times slower
+        if not self.options.asm:
+            return
+        config_log = tools.load("config.log")
+        match = re.search(r"^asm:\s+(\S+)", config_log, re.MULTILINE)
+        if not match or match.group(1) != "yes":
+            raise ConanException("x264 configure could not enable assembly for %s (see config.log); "
+                                 "use -o libx264:asm=False to build the slower C-only library"
+                                 % self.settings.arch)
+
     def build(self):
         with tools.vcvars(self.settings) if self._is_msvc else tools.no_op():
             autotools = self._configure_autotools()
@@ -111,7 +151,9 @@ class LibX264Conan(ConanFile):
         else:
             self.cpp_info.libs = ['x264']
         if self.settings.os == "Linux":
-            self.cpp_info.system_libs.extend(['dl', 'pthread', 'm'])
+            self.cpp_info.system_libs.extend(['dl', 'm'])
+            if self.options.threads:
+                self.cpp_info.system_libs.append('pthread')
         elif self.settings.os == "Android":
             self.cpp_info.system_libs.extend(['dl', 'm'])
         self.cpp_info.names['pkg_config'] = 'x264'
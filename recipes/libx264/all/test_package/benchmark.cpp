@@ -0,0 +1,180 @@
+// Encode speed benchmark for the packaged x264 library.
+//
+// Usage: benchmark <frames> <comma separated presets> <output json>
+//
+// A synthetic 1080p 4:2:0 clip (moving gradients over a static noise
+// texture) is generated once in memory and encoded with each preset using
+// the default thread count. Encoded frames per second and the average
+// bitrate at 25 fps are reported. The clip is 8-bit unless the library only
+// supports 10-bit encoding.
+
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <sstream>
+#include <stdint.h>
+#include <string>
+#include <vector>
+#include "x264.h"
+
+namespace {
+
+const int kWidth = 1920;
+const int kHeight = 1080;
+const int kFps = 25;
+// X264_BIT_DEPTH is 0 when the library was built with bit_depth=all
+const int kBitDepth = X264_BIT_DEPTH == 0 ? 8 : X264_BIT_DEPTH;
+const size_t kBytesPerSample = kBitDepth > 8 ? 2 : 1;
+
+std::vector<uint8_t> generate_clip(int frames)
+{
+    const size_t lumaSize = size_t(kWidth) * kHeight;
+    const size_t frameSize = lumaSize * 3 / 2;
+    std::vector<uint8_t> clip(frameSize * frames);
+    std::vector<uint8_t> noise(lumaSize);
+    uint32_t state = 2463534242u;
+    for (size_t i = 0; i < lumaSize; ++i) {
+        state ^= state << 13; state ^= state >> 17; state ^= state << 5;
+        noise[i] = uint8_t(state & 0x1F);
+    }
+    for (int f = 0; f < frames; ++f) {
+        uint8_t* const y = &clip[frameSize * f];
+        uint8_t* const u = y + lumaSize;
+        uint8_t* const v = u + lumaSize / 4;
+        for (int row = 0; row < kHeight; ++row)
+            for (int col = 0; col < kWidth; ++col)
+                y[row * kWidth + col] = uint8_t(((col + 4 * f) & 0xFF) / 2 + ((row + 2 * f) & 0x7F) / 2
+                                                + noise[row * kWidth + col] / 4);
+        for (int row = 0; row < kHeight / 2; ++row) {
+            for (int col = 0; col < kWidth / 2; ++col) {
+                u[row * kWidth / 2 + col] = uint8_t(128 + ((col - f) & 0x3F) - 32);
+                v[row * kWidth / 2 + col] = uint8_t(128 + ((row + f) & 0x3F) - 32);
+            }
+        }
+    }
+    if (kBytesPerSample == 1)
+        return clip;
+    // high bit depth pictures are 16-bit samples in native byte order
+    std::vector<uint8_t> wide(clip.size() * 2);
+    for (size_t i = 0; i < clip.size(); ++i) {
+        const uint16_t sample = uint16_t(clip[i] << (kBitDepth - 8));
+        std::memcpy(&wide[2 * i], &sample, 2);
+    }
+    return wide;
+}
+
+// Returns the encode time in seconds and the stream size in bytes, or false on error
+bool encode(const std::string& preset, const std::vector<uint8_t>& clip, int frames,
+            double& seconds, uint64_t& bytes, int& threads)
+{
+    x264_param_t param;
+    if (x264_param_default_preset(&param, preset.c_str(), NULL) < 0) {
+        std::fprintf(stderr, "unknown preset %s\n", preset.c_str());
+        return false;
+    }
+    param.i_width = kWidth;
+    param.i_height = kHeight;
+    param.i_csp = X264_CSP_I420;
+    param.i_bitdepth = kBitDepth;
+    param.i_fps_num = kFps;
+    param.i_fps_den = 1;
+    param.i_log_level = X264_LOG_ERROR;
+    param.rc.i_rc_method = X264_RC_CRF;
+    param.rc.f_rf_constant = 23;
+    if (x264_param_apply_profile(&param, kBitDepth > 8 ? "high10" : "high") < 0)
+        return false;
+
+    x264_picture_t picture;
+    x264_picture_t output;
+    x264_picture_init(&picture);
+    picture.img.i_csp = kBitDepth > 8 ? X264_CSP_I420 | X264_CSP_HIGH_DEPTH : X264_CSP_I420;
+    picture.img.i_plane = 3;
+    picture.img.i_stride[0] = int(kWidth * kBytesPerSample);
+    picture.img.i_stride[1] = int(kWidth / 2 * kBytesPerSample);
+    picture.img.i_stride[2] = int(kWidth / 2 * kBytesPerSample);
+
+    const std::chrono::steady_clock::time_point start = std::chrono::steady_clock::now();
+    x264_t* const encoder = x264_encoder_open(&param);
+    if (encoder == NULL)
+        return false;
+    x264_encoder_parameters(encoder, &param);
+    threads = param.i_threads;
+
+    const size_t lumaSize = size_t(kWidth) * kHeight * kBytesPerSample;
+    x264_nal_t* nals;
+    int nalCount;
+    bytes = 0;
+    for (int f = 0; f < frames; ++f) {
+        uint8_t* const frame = const_cast<uint8_t*>(&clip[lumaSize * 3 / 2 * f]);
+        picture.img.plane[0] = frame;
+        picture.img.plane[1] = frame + lumaSize;
+        picture.img.plane[2] = frame + lumaSize * 5 / 4;
+        picture.i_pts = f;
+        const int size = x264_encoder_encode(encoder, &nals, &nalCount, &picture, &output);
+        if (size < 0) {
+            x264_encoder_close(encoder);
+            return false;
+        }
+        bytes += size;
+    }
+    while (x264_encoder_delayed_frames(encoder)) {
+        const int size = x264_encoder_encode(encoder, &nals, &nalCount, NULL, &output);
+        if (size < 0) {
+            x264_encoder_close(encoder);
+            return false;
+        }
+        bytes += size;
+    }
+    x264_encoder_close(encoder);
+    seconds = std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
+    return true;
+}
+
+}  // namespace
+
+int main(int argc, char** argv)
+{
+    const int frames = argc > 1 ? std::atoi(argv[1]) : 120;
+    const std::string presets = argc > 2 ? argv[2] : "ultrafast,veryfast,medium";
+    const char* const outName = argc > 3 ? argv[3] : "libx264_benchmark.json";
+    if (frames <= 0) {
+        std::fprintf(stderr, "invalid frame count\n");
+        return 2;
+    }
+
+    const std::vector<uint8_t> clip = generate_clip(frames);
+    std::FILE* const out = std::fopen(outName, "w");
+    if (out == NULL) {
+        std::perror(outName);
+        return 3;
+    }
+    std::fprintf(out, "{\n  \"x264_build\": %d,\n  \"library_bit_depth\": %d,\n  \"bit_depth\": %d,\n"
+                      "  \"width\": %d,\n  \"height\": %d,\n  \"frames\": %d,\n  \"results\": [",
+                 X264_BUILD, X264_BIT_DEPTH, kBitDepth, kWidth, kHeight, frames);
+
+    std::istringstream list(presets);
+    std::string preset;
+    bool first = true;
+    while (std::getline(list, preset, ',')) {
+        double seconds = 0.0;
+        uint64_t bytes = 0;
+        int threads = 0;
+        if (!encode(preset, clip, frames, seconds, bytes, threads)) {
+            std::fprintf(stderr, "encoding with preset %s failed\n", preset.c_str());
+            std::fclose(out);
+            return 4;
+        }
+        const double fps = frames / seconds;
+        const double kbps = bytes * 8.0 * kFps / frames / 1000.0;
+        std::printf("%-10s %8.2f frames/s %10.0f kb/s (%d threads)\n", preset.c_str(), fps, kbps, threads);
+        std::fprintf(out, "%s\n    {\"preset\": \"%s\", \"threads\": %d, \"frames_per_second\": %.2f, \"kbps\": %.0f}",
+                     first ? "" : ",", preset.c_str(), threads, fps, kbps);
+        first = false;
+    }
+
+    std::fprintf(out, "\n  ]\n}\n");
+    std::fclose(out);
+    std::printf("results written to %s\n", outName);
+    return 0;
+}
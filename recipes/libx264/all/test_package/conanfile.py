@@ -8,6 +8,7 @@ class TestPackageConan(ConanFile):
 
     def build(self):
         cmake = CMake(self)
+        cmake.definitions["BUILD_BENCHMARK"] = tools.get_env("CONAN_LIBX264_BENCHMARK", False)
         cmake.configure()
         cmake.build()
 
@@ -16,3 +17,11 @@ class TestPackageConan(ConanFile):
             return
         bin_path = os.path.join("bin", "test_package")
         self.run(bin_path, run_environment=True)
+        # Opt-in encode speed benchmark: CONAN_LIBX264_BENCHMARK=1, clip length from
+        # CONAN_LIBX264_BENCHMARK_FRAMES and presets from CONAN_LIBX264_BENCHMARK_PRESETS
+        if tools.get_env("CONAN_LIBX264_BENCHMARK", False):
+            frames = tools.get_env("CONAN_LIBX264_BENCHMARK_FRAMES", 120)
+            presets = tools.get_env("CONAN_LIBX264_BENCHMARK_PRESETS", "ultrafast,veryfast,medium")
+            results = os.path.join(self.build_folder, "libx264_benchmark.json")
+            self.run("%s %s %s \"%s\"" % (os.path.join("bin", "benchmark"), frames, presets, results),
+                     run_environment=True)
@@ -0,0 +1,88 @@
+import os
+
+from conans import CMake, ConanFile, tools
+
+
+class OpenblasConan(ConanFile):
+    name = "openblas"
+    description = "An optimized BLAS library based on GotoBLAS2 1.13 BSD version"
+    topics = ("conan", "openblas", "blas", "lapack", "linear-algebra")
+    url = "https://github.com/conan-io/conan-center-index"
+    homepage = "https://www.openblas.net"
+    license = "BSD-3-Clause"
+    exports_sources = ["CMakeLists.txt"]
+    generators = "cmake"
+
+    settings = "os", "arch", "compiler", "build_type"
+    options = {
+        "shared": [True, False],
+        "fPIC": [True, False],
+        "build_lapack": [True, False],
+        "use_thread": [True, False],
+        "dynamic_arch": [True, False]
+    }
+    default_options = {
+        "shared": False,
+        "fPIC": True,
+        "build_lapack": False,
+        "use_thread": True,
+        "dynamic_arch": False
+    }
+
+    _source_subfolder = "source_subfolder"
+    _build_subfolder = "build_subfolder"
+
+    def config_options(self):
+        if self.settings.os == "Windows":
+            del self.options.fPIC
+
+    def configure(self):
+        del self.settings.compiler.libcxx
+        del self.settings.compiler.cppstd
+
+    def source(self):
+        tools.get(**self.conan_data["sources"][self.version])
+        extracted_dir = "OpenBLAS-" + self.version
+        os.rename(extracted_dir, self._source_subfolder)
+
+    def _configure_cmake(self):
+        cmake = CMake(self)
+        if self.options.build_lapack:
+            self.output.warn("Building LAPACK and LAPACKE requires a Fortran compiler")
+        cmake.definitions["NOFORTRAN"] = not self.options.build_lapack
+        cmake.definitions["BUILD_WITHOUT_LAPACK"] = not self.options.build_lapack
+        # dynamic_arch builds kernels for every CPU of the target architecture and
+        # picks one at runtime, instead of tuning for the build machine only
+        cmake.definitions["DYNAMIC_ARCH"] = self.options.dynamic_arch
+        cmake.definitions["USE_THREAD"] = self.options.use_thread
+        # the runtime is managed by Conan
+        cmake.definitions["MSVC_STATIC_CRT"] = False
+        cmake.definitions["BUILD_TESTING"] = False
+        cmake.configure(build_folder=self._build_subfolder)
+        return cmake
+
+    def build(self):
+        cmake = self._configure_cmake()
+        cmake.build()
+
+    def package(self):
+        self.copy("LICENSE", src=self._source_subfolder, dst="licenses")
+        cmake = self._configure_cmake()
+        cmake.install()
+        tools.rmdir(os.path.join(self.package_folder, "lib", "cmake"))
+        tools.rmdir(os.path.join(self.package_folder, "lib", "pkgconfig"))
+        tools.rmdir(os.path.join(self.package_folder, "share"))
+
+    def package_info(self):
+        self.cpp_info.names["cmake_find_package"] = "OpenBLAS"
+        self.cpp_info.names["cmake_find_package_multi"] = "OpenBLAS"
+        self.cpp_info.names["pkg_config"] = "openblas"
+        self.cpp_info.libs = tools.collect_libs(self)
+        # cblas.h, lapacke.h and openblas_config.h are installed to include/openblas
+        self.cpp_info.includedirs.append(os.path.join("include", "openblas"))
+        if self.settings.os == "Linux":
+            self.cpp_info.system_libs = ["m"]
+            if self.options.use_thread:
+                self.cpp_info.system_libs.append("pthread")
+            if self.options.build_lapack:
+                self.cpp_info.system_libs.append("gfortran")
@@ -0,0 +1,25 @@
+#include <stdio.h>
+#include <stdlib.h>
+
+#include <cblas.h>
+
+int main(void)
+{
+    const double A[] = {1.0, 2.0, 1.0, -3.0, 4.0, -1.0};
+    const double B[] = {1.0, 2.0, 1.0, -3.0, 4.0, -1.0};
+    const double expected[] = {11.0, -9.0, 5.0, -9.0, 21.0, -1.0, 5.0, -1.0, 3.0};
+    double C[] = {0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5};
+    int i;
+
+    /* C = A * B^T with A and B 3x2 */
+    cblas_dgemm(CblasColMajor, CblasNoTrans, CblasTrans, 3, 3, 2, 1.0, A, 3, B, 3, 2.0, C, 3);
+    for (i = 0; i < 9; ++i) {
+        printf("%g ", C[i]);
+        if (C[i] != expected[i]) {
+            printf("\nunexpected dgemm result\n");
+            return EXIT_FAILURE;
+        }
+    }
+    printf("\n%s\n", openblas_get_config());
+    return EXIT_SUCCESS;
+}
@@ -8,8 +8,8 @@ class OpenjpegConan(ConanFile):
     url = "https://github.com/conan-io/conan-center-index"
     description = "OpenJPEG is an open-source JPEG 2000 codec written in C language."
     topics = ("conan", "jpeg2000", "jp2", "openjpeg", "image", "multimedia", "format", "graphics")
-    options = {"shared": [True, False], "build_codec": [True, False], "fPIC": [True, False]}
-    default_options = {'shared': False, 'build_codec': True, 'fPIC': True}
+    options = {"shared": [True, False], "build_codec": [True, False], "fPIC": [True, False], "threads": [True, False]}
+    default_options = {'shared': False, 'build_codec': True, 'fPIC': True, 'threads': True}
     settings = "os", "compiler", "build_type", "arch"
     generators = "cmake", "cmake_find_package"
     homepage = "https://github.com/uclouvain/openjpeg"
@@ -38,6 +38,7 @@ class OpenjpegConan(ConanFile):
         cmake.definitions['BUILD_PKGCONFIG_FILES'] = False
         cmake.definitions['CMAKE_INSTALL_SYSTEM_RUNTIME_LIBS_SKIP'] = True
         cmake.definitions['BUILD_CODEC'] = False
+        cmake.definitions['OPJ_USE_THREAD'] = self.options.threads
 
         cmake.configure()
         return cmake
@@ -101,7 +102,9 @@ class OpenjpegConan(ConanFile):
         if not self.options.shared:
             self.cpp_info.defines.append('OPJ_STATIC')
         if self.settings.os == "Linux":
-            self.cpp_info.system_libs = ["pthread", "m"]
+            self.cpp_info.system_libs = ["m"]
+            if self.options.threads:
+                self.cpp_info.system_libs.append("pthread")
         self.cpp_info.names["cmake_find_package"] = "OpenJPEG"
         self.cpp_info.names["cmake_find_package_multi"] = "OpenJPEG"
         self.cpp_info.names['pkg_config'] = 'libopenjp2'
@@ -0,0 +1,175 @@
+/*
+ * Multithreaded decode benchmark for the packaged openjpeg library.
+ *
+ * Usage: benchmark <image side in pixels> <max threads, 0 = all CPUs> <output json>
+ *
+ * A square RGB image is generated, encoded once as a tiled J2K codestream
+ * (512x512 tiles, irreversible wavelet, 20:1) and decoded with 1, 2, 4, ...
+ * threads up to the maximum. The best of three decodes is reported in
+ * megapixels per second.
+ */
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+#include <openjpeg.h>
+
+#define TILE_SIZE 512
+#define REPEATS 3
+
+static const char* const kCodestream = "benchmark.j2k";
+
+
+static double now_seconds(void)
+{
+    struct timespec ts;
+    timespec_get(&ts, TIME_UTC);
+    return (double)ts.tv_sec + (double)ts.tv_nsec / 1e9;
+}
+
+/* Smooth gradients plus a little deterministic noise, so tiles do not compress to nothing */
+static opj_image_t* generate_image(OPJ_UINT32 side)
+{
+    opj_image_cmptparm_t params[3];
+    opj_image_t* image;
+    unsigned int state = 2463534242u;
+    OPJ_UINT32 c, x, y;
+
+    memset(params, 0, sizeof(params));
+    for (c = 0; c < 3; ++c) {
+        params[c].dx = 1;
+        params[c].dy = 1;
+        params[c].w = side;
+        params[c].h = side;
+        params[c].prec = 8;
+        params[c].bpp = 8;
+        params[c].sgnd = 0;
+    }
+    image = opj_image_create(3, params, OPJ_CLRSPC_SRGB);
+    if (image == NULL) return NULL;
+    image->x0 = 0;
+    image->y0 = 0;
+    image->x1 = side;
+    image->y1 = side;
+
+    for (y = 0; y < side; ++y) {
+        for (x = 0; x < side; ++x) {
+            OPJ_UINT32 const i = y * side + x;
+            state ^= state << 13; state ^= state >> 17; state ^= state << 5;
+            image->comps[0].data[i] = (OPJ_INT32)(((x * 255) / side + (state & 0xF)) & 0xFF);
+            image->comps[1].data[i] = (OPJ_INT32)(((y * 255) / side + ((state >> 4) & 0xF)) & 0xFF);
+            image->comps[2].data[i] = (OPJ_INT32)((((x ^ y) & 0xFF) + ((state >> 8) & 0x7)) & 0xFF);
+        }
+    }
+    return image;
+}
+
+static int encode(opj_image_t* image)
+{
+    opj_cparameters_t params;
+    opj_codec_t* const codec = opj_create_compress(OPJ_CODEC_J2K);
+    opj_stream_t* stream;
+    int ok;
+
+    opj_set_default_encoder_parameters(&params);
+    params.tcp_numlayers = 1;
+    params.tcp_rates[0] = 20;
+    params.cp_disto_alloc = 1;
+    params.irreversible = 1;
+    params.tcp_mct = 1;
+    params.tile_size_on = OPJ_TRUE;
+    params.cp_tx0 = 0;
+    params.cp_ty0 = 0;
+    params.cp_tdx = TILE_SIZE;
+    params.cp_tdy = TILE_SIZE;
+
+    if (codec == NULL || !opj_setup_encoder(codec, &params, image)) return 0;
+    stream = opj_stream_create_default_file_stream(kCodestream, OPJ_FALSE);
+    if (stream == NULL) { opj_destroy_codec(codec); return 0; }
+    ok = opj_start_compress(codec, image, stream) && opj_encode(codec, stream) && opj_end_compress(codec, stream);
+    opj_stream_destroy(stream);
+    opj_destroy_codec(codec);
+    return ok;
+}
+
+/* Returns the decode time in seconds, or a negative value on error */
+static double decode(int threads)
+{
+    opj_dparameters_t params;
+    opj_codec_t* const codec = opj_create_decompress(OPJ_CODEC_J2K);
+    opj_stream_t* stream;
+    opj_image_t* image = NULL;
+    double start, seconds = -1.0;
+
+    opj_set_default_decoder_parameters(&params);
+    if (codec == NULL || !opj_setup_decoder(codec, &params)
+        || (opj_has_thread_support() && !opj_codec_set_threads(codec, threads))) {
+        if (codec != NULL) opj_destroy_codec(codec);
+        return -1.0;
+    }
+    stream = opj_stream_create_default_file_stream(kCodestream, OPJ_TRUE);
+    if (stream == NULL) { opj_destroy_codec(codec); return -1.0; }
+
+    start = now_seconds();
+    if (opj_read_header(stream, codec, &image) && opj_decode(codec, stream, image) && opj_end_decompress(codec, stream))
+        seconds = now_seconds() - start;
+
+    opj_image_destroy(image);
+    opj_stream_destroy(stream);
+    opj_destroy_codec(codec);
+    return seconds;
+}
+
+int main(int argc, const char** argv)
+{
+    OPJ_UINT32 const side = argc > 1 ? (OPJ_UINT32)strtoul(argv[1], NULL, 10) : 4096;
+    int maxThreads = argc > 2 ? atoi(argv[2]) : 0;
+    const char* const outName = argc > 3 ? argv[3] : "openjpeg_benchmark.json";
+    double const megapixels = (double)side * side / 1e6;
+    opj_image_t* image;
+    FILE* out;
+    int threads, first = 1;
+    double start;
+
+    if (side == 0) { fprintf(stderr, "invalid image size\n"); return 2; }
+    if (maxThreads <= 0) maxThreads = opj_get_num_cpus();
+    if (!opj_has_thread_support()) {
+        printf("openjpeg built without thread support, measuring 1 thread only\n");
+        maxThreads = 1;
+    }
+
+    image = generate_image(side);
+    if (image == NULL) { fprintf(stderr, "failed to allocate a %ux%u image\n", side, side); return 10; }
+    start = now_seconds();
+    if (!encode(image)) { fprintf(stderr, "encoding failed\n"); return 11; }
+    printf("encoded %ux%u RGB (%.1f MP) in %.2fs\n", side, side, megapixels, now_seconds() - start);
+    opj_image_destroy(image);
+
+    out = fopen(outName, "w");
+    if (out == NULL) { perror(outName); return 3; }
+    fprintf(out, "{\n  \"openjpeg_version\": \"%s\",\n  \"width\": %u,\n  \"height\": %u,\n"
+                 "  \"tile_size\": %d,\n  \"results\": [", opj_version(), side, side, TILE_SIZE);
+
+    /* 1, 2, 4, ... and finally maxThreads */
+    for (threads = 1; ; threads = threads * 2 < maxThreads ? threads * 2 : maxThreads) {
+        double best = -1.0;
+        int r;
+        for (r = 0; r < REPEATS; ++r) {
+            double const seconds = decode(threads);
+            if (seconds < 0) { fprintf(stderr, "decoding with %d threads failed\n", threads); return 12; }
+            if (best < 0 || seconds < best) best = seconds;
+        }
+        printf("threads %2d: %.2fs, %.1f MP/s\n", threads, best, megapixels / best);
+        fprintf(out, "%s\n    {\"threads\": %d, \"seconds\": %.4f, \"megapixels_per_second\": %.2f}",
+                first ? "" : ",", threads, best, megapixels / best);
+        first = 0;
+        if (threads == maxThreads) break;
+    }
+
+    fprintf(out, "\n  ]\n}\n");
+    fclose(out);
+    remove(kCodestream);
+    printf("results written to %s\n", outName);
+    return 0;
+}
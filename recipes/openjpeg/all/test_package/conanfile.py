@@ -8,6 +8,7 @@ class TestPackageConan(ConanFile):
 
     def build(self):
         cmake = CMake(self)
+        cmake.definitions["BUILD_BENCHMARK"] = tools.get_env("CONAN_OPENJPEG_BENCHMARK", False)
         cmake.configure()
         cmake.build()
 
@@ -15,3 +16,11 @@ class TestPackageConan(ConanFile):
         if not tools.cross_building(self.settings):
             bin_path = os.path.join("bin", "test_package")
             self.run(bin_path, run_environment=True)
+            # Opt-in decode benchmark: CONAN_OPENJPEG_BENCHMARK=1, image side from
+            # CONAN_OPENJPEG_BENCHMARK_SIZE and thread limit from CONAN_OPENJPEG_BENCHMARK_THREADS
+            if tools.get_env("CONAN_OPENJPEG_BENCHMARK", False):
+                size = tools.get_env("CONAN_OPENJPEG_BENCHMARK_SIZE", 4096)
+                threads = tools.get_env("CONAN_OPENJPEG_BENCHMARK_THREADS", 0)
+                results = os.path.join(self.build_folder, "openjpeg_benchmark.json")
+                self.run("%s %s %s \"%s\"" % (os.path.join("bin", "benchmark"), size, threads, results),
+                         run_environment=True)
@@ -91,9 +91,12 @@ class OpenSSLConan(ConanFile):
                "no_async": [True, False],
                "no_dso": [True, False],
                "capieng_dialog": [True, False],
+               "enable_ec_nistp_64_gcc_128": [True, False],
+               "cpu_baseline": ["generic", "x86-64-v2", "x86-64-v3", "x86-64-v4"],
                "openssldir": "ANY"}
     default_options = {key: False for key in options.keys()}
     default_options["fPIC"] = True
+    default_options["cpu_baseline"] = "generic"
     default_options["openssldir"] = None
     _env_build = None
     _source_subfolder = "sources"
@@ -143,17 +146,38 @@ class OpenSSLConan(ConanFile):
     def configure(self):
         del self.settings.compiler.libcxx
         del self.settings.compiler.cppstd
+        if self.options.enable_ec_nistp_64_gcc_128:
+            # these implementations need __uint128_t on a 64-bit little-endian target
+            if self._is_msvc or str(self.settings.arch) not in ["x86_64", "armv8", "ppc64le", "mips64", "s390x"]:
+                raise ConanInvalidConfiguration("enable_ec_nistp_64_gcc_128 requires a 64-bit target and a compiler "
+                                                "providing __uint128_t")
 
     def config_options(self):
         if self.settings.os != "Windows":
             del self.options.capieng_dialog
         else:
             del self.options.fPIC
+        if self.settings.arch != "x86_64":
+            del self.options.cpu_baseline
 
     def requirements(self):
         if not self.options.no_zlib:
             self.requires("zlib/1.2.11")
 
+    @property
+    def _cpu_baseline_flags(self):
+        # Only affects the C code, the assembly modules keep dispatching at runtime
+        baseline = str(self.options.get_safe("cpu_baseline") or "generic")
+        if self._use_nmake:
+            return {"x86-64-v3": ["/arch:AVX2"],
+                    "x86-64-v4": ["/arch:AVX512"]}.get(baseline, [])
+        v2 = ["-msse4.2", "-mpclmul", "-mpopcnt"]
+        v3 = v2 + ["-mavx", "-mavx2", "-mbmi", "-mbmi2", "-mf16c", "-mfma", "-mlzcnt", "-mmovbe"]
+        v4 = v3 + ["-mavx512f", "-mavx512bw", "-mavx512cd", "-mavx512dq", "-mavx512vl"]
+        return {"x86-64-v2": v2,
+                "x86-64-v3": v3,
+                "x86-64-v4": v4}.get(baseline, [])
+
     @property
     def _target_prefix(self):
         if self._full_version < "1.1.0" and self.settings.build_type == "Debug":
@@ -368,6 +392,8 @@ class OpenSSLConan(ConanFile):
             args.append("-fPIC" if self.options.fPIC else "")
         if self.settings.os == "Neutrino":
             args.append("-lsocket no-asm")
+        if self.options.enable_ec_nistp_64_gcc_128:
+            args.append("enable-ec_nistp_64_gcc_128")
 
         if "zlib" in self.deps_cpp_info.deps:
             zlib_info = self.deps_cpp_info["zlib"]
@@ -385,7 +411,8 @@ class OpenSSLConan(ConanFile):
 
         for option_name in self.options.values.fields:
             activated = getattr(self.options, option_name)
-            if activated and option_name not in ["fPIC", "openssldir", "capieng_dialog"]:
+            if activated and option_name not in ["fPIC", "openssldir", "capieng_dialog",
+                                                 "enable_ec_nistp_64_gcc_128", "cpu_baseline"]:
                 self.output.info("activated option: %s" % option_name)
                 args.append(option_name.replace("_", "-"))
         return args
@@ -410,6 +437,7 @@ class OpenSSLConan(ConanFile):
 
         env_build = self._get_env_build()
         cflags.extend(env_build.flags)
+        cflags.extend(self._cpu_baseline_flags)
         cxxflags = cflags[:]
         cxxflags.extend(env_build.cxx_flags)
 
@@ -519,7 +547,7 @@ class OpenSSLConan(ConanFile):
         with tools.vcvars(self.settings) if self._use_nmake else tools.no_op():
             env_vars = {"PERL": self._perl}
             if self._full_version < "1.1.0":
-                cflags = " ".join(self._get_env_build().flags)
+                cflags = " ".join(self._get_env_build().flags + self._cpu_baseline_flags)
                 env_vars["CC"] = "%s %s" % (self._cc, cflags)
             if self.settings.compiler == "apple-clang":
                 xcrun = tools.XCRun(self.settings)
@@ -22,7 +22,12 @@ class RocksDB(ConanFile):
         "with_lz4": [True, False],
         "with_zlib": [True, False],
         "with_zstd": [True, False],
-        "with_tbb": [True, False]
+        "with_tbb": [True, False],
+        "with_jemalloc": [True, False],
+        "with_numa": [True, False],
+        "with_folly_distributed_mutex": [True, False],
+        "cpu_level": ["native", "portable", "x86-64-v2", "x86-64-v3", "x86-64-v4"],
+        "force_sse42": [True, False]
     }
     default_options = {
         "shared": False,
@@ -33,7 +38,12 @@ class RocksDB(ConanFile):
         "with_zlib": False,
         "with_zstd": False,
         "with_gflags": False,
-        "with_tbb": False
+        "with_tbb": False,
+        "with_jemalloc": False,
+        "with_numa": False,
+        "with_folly_distributed_mutex": False,
+        "cpu_level": "native",
+        "force_sse42": False
     }
     exports_sources = ["CMakeLists.txt"]
     generators = ["cmake"]
@@ -50,18 +60,54 @@ class RocksDB(ConanFile):
     def config_options(self):
         if self.settings.os == "Windows":
             del self.options.fPIC
+        if self.settings.os != "Linux":
+            del self.options.with_numa
+        if self.settings.arch not in ["x86", "x86_64"]:
+            del self.options.force_sse42
 
     def configure(self):
         if self.settings.os == "Windows" and \
            self.settings.compiler == "Visual Studio" and \
            Version(self.settings.compiler.version) < "15":
             raise ConanInvalidConfiguration("Rocksdb requires Visual Studio 15 or later.")
+        if self.options.cpu_level not in ["native", "portable"] and self.settings.arch != "x86_64":
+            raise ConanInvalidConfiguration("cpu_level=%s is only valid for x86_64" % self.options.cpu_level)
+
+    @property
+    def _arch_flags(self):
+        # Flags for the x86-64 microarchitecture levels, spelled out so that they work with
+        # compilers predating -march=x86-64-vN
+        level = str(self.options.cpu_level)
+        if self.settings.compiler == "Visual Studio":
+            return {"x86-64-v3": ["/arch:AVX2"],
+                    "x86-64-v4": ["/arch:AVX512"]}.get(level, [])
+        v2 = ["-msse4.2", "-mpclmul", "-mpopcnt"]
+        v3 = v2 + ["-mavx", "-mavx2", "-mbmi", "-mbmi2", "-mf16c", "-mfma", "-mlzcnt", "-mmovbe"]
+        v4 = v3 + ["-mavx512f", "-mavx512bw", "-mavx512cd", "-mavx512dq", "-mavx512vl"]
+        return {"x86-64-v2": v2,
+                "x86-64-v3": v3,
+                "x86-64-v4": v4}.get(level, [])
 
     def source(self):
         tools.get(**self.conan_data["sources"][self.version])
         extracted_dir = self.name + "-" + os.path.basename(self.conan_data["sources"][self.version]["url"]).split(".")[0]
         os.rename(extracted_dir, self._source_subfolder)
 
+    def system_requirements(self):
+        if self.options.get_safe("with_numa"):
+            package_tool = tools.SystemPackageTool(conanfile=self)
+            os_info = tools.OSInfo()
+            if os_info.with_apt:
+                libnuma_name = "libnuma-dev"
+            elif os_info.with_yum or os_info.with_zypper:
+                libnuma_name = "numactl-devel"
+            elif os_info.with_pacman:
+                libnuma_name = "numactl"
+            else:
+                self.output.warn("Could not install libnuma: Undefined package name for current platform.")
+                return
+            package_tool.install(packages=libnuma_name, update=True)
+
     def _configure_cmake(self):
         if not self._cmake:
             self._cmake = CMake(self)
@@ -70,7 +116,12 @@ class RocksDB(ConanFile):
         self._cmake.definitions["ROCKSDB_LITE"] = self.options.lite
         self._cmake.definitions["WITH_TESTS"] = False
         self._cmake.definitions["WITH_TOOLS"] = False
-        self._cmake.definitions["WITH_FOLLY_DISTRIBUTED_MUTEX"] = False
+        self._cmake.definitions["WITH_FOLLY_DISTRIBUTED_MUTEX"] = self.options.with_folly_distributed_mutex
+        self._cmake.definitions["PORTABLE"] = self.options.cpu_level != "native"
+        # SSE4.2 and PCLMUL enable the hardware CRC32c path, every x86-64-vN level includes them
+        self._cmake.definitions["FORCE_SSE42"] = bool(self.options.get_safe("force_sse42")) or \
+                                                 self.options.cpu_level not in ["native", "portable"]
+        self._cmake.definitions["CONAN_ROCKSDB_ARCH_FLAGS"] = " ".join(self._arch_flags)
         self._cmake.definitions["WITH_GFLAGS"] = self.options.with_gflags
         self._cmake.definitions["WITH_SNAPPY"] = self.options.with_snappy
         self._cmake.definitions["WITH_LZ4"] = self.options.with_lz4
@@ -79,9 +130,8 @@ class RocksDB(ConanFile):
         self._cmake.definitions["WITH_TBB"] = self.options.with_tbb
         self._cmake.definitions["ROCKSDB_BUILD_SHARED"] = self.options.shared
         self._cmake.definitions["WITH_BENCHMARK_TOOLS"] = False
-        # not available yet in CCI
-        self._cmake.definitions["WITH_JEMALLOC"] = False
-        self._cmake.definitions["WITH_NUMA"] = False
+        self._cmake.definitions["WITH_JEMALLOC"] = self.options.with_jemalloc
+        self._cmake.definitions["WITH_NUMA"] = bool(self.options.get_safe("with_numa"))
 
         self._cmake.configure(build_folder=self._build_subfolder)
         return self._cmake
@@ -103,6 +153,8 @@ class RocksDB(ConanFile):
             self.requires("zstd/1.3.8")
         if self.options.with_tbb:
             self.requires("tbb/2019_u9")
+        if self.options.with_jemalloc:
+            self.requires("jemalloc/5.2.1")
 
     def package(self):
         self.copy("COPYING", dst="licenses", src=self._source_subfolder)
@@ -121,5 +173,7 @@ class RocksDB(ConanFile):
                 self.cpp_info.defines = ["ROCKSDB_DLL", "ROCKSDB_LIBRARY_EXPORTS"]
         elif self.settings.os == "Linux":
             self.cpp_info.system_libs = ["pthread", "m"]
+            if self.options.with_numa:
+                self.cpp_info.system_libs.append("numa")
         if self.options.lite:
             self.cpp_info.defines.append("ROCKSDB_LITE")
@@ -1,5 +1,6 @@
 import os
 from conans import ConanFile, CMake, tools
+from conans.errors import ConanInvalidConfiguration
 
 
 class ConanSqlite3(ConanFile):
@@ -25,6 +26,16 @@ class ConanSqlite3(ConanFile):
                "omit_load_extension": [True, False],
                "enable_unlock_notify": [True, False],
                "disable_gethostuuid": [True, False],
+               "default_memstatus": [True, False],
+               "default_wal_synchronous": "ANY",
+               "max_mmap_size": "ANY",
+               "default_mmap_size": "ANY",
+               "default_cache_size": "ANY",
+               "enable_stat4": [True, False],
+               "like_doesnt_match_blobs": [True, False],
+               "use_alloca": [True, False],
+               "omit_deprecated": [True, False],
+               "performance_profile": [True, False],
                }
     default_options = {"shared": False,
                        "fPIC": True,
@@ -39,6 +50,16 @@ class ConanSqlite3(ConanFile):
                        "omit_load_extension": False,
                        "enable_unlock_notify": True,
                        "disable_gethostuuid": False,
+                       "default_memstatus": True,
+                       "default_wal_synchronous": None,
+                       "max_mmap_size": None,
+                       "default_mmap_size": None,
+                       "default_cache_size": None,
+                       "enable_stat4": False,
+                       "like_doesnt_match_blobs": False,
+                       "use_alloca": False,
+                       "omit_deprecated": False,
+                       "performance_profile": False,
                        }
     _source_subfolder = "source_subfolder"
 
@@ -53,9 +74,38 @@ class ConanSqlite3(ConanFile):
         if self.settings.os == "Windows":
             del self.options.fPIC
 
+    def _integer_option(self, name):
+        value = str(self.options.get_safe(name))
+        return None if value == "None" else int(value)
+
     def configure(self):
         del self.settings.compiler.libcxx
         del self.settings.compiler.cppstd
+        if self.options.performance_profile:
+            # Recommended options from https://sqlite.org/compile.html, plus 256 MiB
+            # of memory-mapped I/O unless a size was given. Options changed from
+            # their defaults are left as set
+            for name, value in [("default_memstatus", False), ("like_doesnt_match_blobs", True),
+                                ("use_alloca", True), ("omit_deprecated", True)]:
+                if getattr(self.options, name) == self.default_options[name]:
+                    setattr(self.options, name, value)
+            if self._integer_option("default_wal_synchronous") is None:
+                self.options.default_wal_synchronous = 1
+            if self._integer_option("default_mmap_size") is None:
+                self.options.default_mmap_size = 268435456
+        for name in ["default_wal_synchronous", "max_mmap_size", "default_mmap_size", "default_cache_size"]:
+            try:
+                self._integer_option(name)
+            except ValueError:
+                raise ConanInvalidConfiguration("sqlite3:%s must be an integer, got '%s'"
+                                                % (name, self.options.get_safe(name)))
+        if self._integer_option("default_wal_synchronous") not in [None, 0, 1, 2, 3]:
+            raise ConanInvalidConfiguration("sqlite3:default_wal_synchronous must be 0 (OFF), 1 (NORMAL), "
+                                            "2 (FULL) or 3 (EXTRA)")
+        max_mmap_size = self._integer_option("max_mmap_size")
+        default_mmap_size = self._integer_option("default_mmap_size")
+        if max_mmap_size is not None and default_mmap_size is not None and default_mmap_size > max_mmap_size:
+            raise ConanInvalidConfiguration("sqlite3:default_mmap_size cannot be larger than sqlite3:max_mmap_size")
 
     def _configure_cmake(self):
         cmake = CMake(self)
@@ -84,6 +134,15 @@ class ConanSqlite3(ConanFile):
             cmake.definitions["HAVE_POSIX_FALLOCATE"] = False
         if self.options.disable_gethostuuid:
             cmake.definitions["DISABLE_GETHOSTUUID"] = True
+        cmake.definitions["DEFAULT_MEMSTATUS"] = self.options.default_memstatus
+        cmake.definitions["ENABLE_STAT4"] = self.options.enable_stat4
+        cmake.definitions["LIKE_DOESNT_MATCH_BLOBS"] = self.options.like_doesnt_match_blobs
+        cmake.definitions["USE_ALLOCA"] = self.options.use_alloca
+        cmake.definitions["OMIT_DEPRECATED"] = self.options.omit_deprecated
+        for name in ["default_wal_synchronous", "max_mmap_size", "default_mmap_size", "default_cache_size"]:
+            value = self._integer_option(name)
+            if value is not None:
+                cmake.definitions[name.upper()] = value
         cmake.configure()
         return cmake
 
@@ -101,6 +160,10 @@ class ConanSqlite3(ConanFile):
         cmake = self._configure_cmake()
         cmake.install()
 
+    def package_id(self):
+        # the preset only selects other options, which are part of the package id
+        del self.info.options.performance_profile
+
     def package_info(self):
         self.cpp_info.libs = tools.collect_libs(self)
         if self.settings.os == "Linux":
@@ -8,6 +8,10 @@ int main() {
     int result = 0;
 
     printf("SQLite Version: %s\n", sqlite3_libversion());
+    for (result = 0; sqlite3_compileoption_get(result) != NULL; ++result) {
+        printf("  %s\n", sqlite3_compileoption_get(result));
+    }
+    result = 0;
 
     printf("Creating new data base ...\n");
     result = sqlite3_open("bincrafters.db", &db_instance);
@@ -1,4 +1,5 @@
 import os
+import time
 from conans import ConanFile, tools
 from conans.model.version import Version
 from conans.errors import ConanInvalidConfiguration
@@ -60,6 +61,22 @@ that have future-proof scalability"""
         tools.replace_in_file(linux_include, "shell gcc", "shell $(CC)")
         tools.replace_in_file(linux_include, "= gcc", "= $(CC)")
 
+    @property
+    def _make_jobs(self):
+        # tools.cpu_count() already honours CONAN_CPU_COUNT; CONAN_TBB_MAX_JOBS
+        # caps it further for memory-constrained hosts
+        jobs = tools.cpu_count()
+        max_jobs = tools.get_env("CONAN_TBB_MAX_JOBS")
+        if max_jobs:
+            jobs = min(jobs, int(max_jobs))
+        return max(jobs, 1)
+
+    def _run_make(self, command, targets):
+        for target in targets:
+            start = time.time()
+            self.run("%s -j%s %s" % (command, self._make_jobs, target))
+            self.output.info("Built target '%s' in %.1fs" % (target, time.time() - start))
+
     def _get_targets(self):
         targets = ["tbb"]
         if self.options.tbbmalloc:
@@ -144,11 +161,11 @@ MALLOCPROXY.DEF =
                                    "14": "vc14",
                                    "15": "vc14.1",
                                    "16": "vc14.2"}.get(str(self.settings.compiler.version), "vc14.2")
-                    self.run("%s arch=%s runtime=%s %s %s" % (make, arch, runtime, extra, " ".join(targets)))
+                    self._run_make("%s arch=%s runtime=%s %s" % (make, arch, runtime, extra), targets)
             elif self._is_mingw:
-                self.run("%s arch=%s compiler=gcc %s %s" % (make, arch, extra, " ".join(targets)))
+                self._run_make("%s arch=%s compiler=gcc %s" % (make, arch, extra), targets)
             else:
-                self.run("%s arch=%s %s %s" % (make, arch, extra, " ".join(targets)))
+                self._run_make("%s arch=%s %s" % (make, arch, extra), targets)
 
     def package(self):
         self.copy("LICENSE", dst="licenses", src=self._source_subfolder)
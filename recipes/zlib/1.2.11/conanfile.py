@@ -1,7 +1,9 @@
+import glob
 import os
+import shutil
 import stat
 from conans import ConanFile, tools, CMake, AutoToolsBuildEnvironment
-from conans.errors import ConanException
+from conans.errors import ConanException, ConanInvalidConfiguration
 
 
 class ZlibConan(ConanFile):
@@ -13,11 +15,13 @@ class ZlibConan(ConanFile):
     description = ("A Massively Spiffy Yet Delicately Unobtrusive Compression Library "
                    "(Also Free, Not to Mention Unencumbered by Patents)")
     settings = "os", "arch", "compiler", "build_type"
-    options = {"shared": [True, False], "fPIC": [True, False], "minizip": [True, False]}
-    default_options = "shared=False", "fPIC=True", "minizip=False"
-    exports_sources = ["CMakeLists.txt", "CMakeLists_minizip.txt", "minizip.patch"]
+    options = {"shared": [True, False], "fPIC": [True, False], "minizip": [True, False],
+               "backend": ["zlib", "zlib-ng"]}
+    default_options = "shared=False", "fPIC=True", "minizip=False", "backend=zlib"
+    exports_sources = ["CMakeLists.txt", "CMakeLists_minizip.txt", "CMakeLists_zlib-ng.txt", "minizip.patch"]
     generators = "cmake"
     _source_subfolder = "source_subfolder"
+    _zlib_ng_folder = "zlib_ng"
 
     def config_options(self):
         if self.settings.os == "Windows":
@@ -26,6 +30,8 @@ class ZlibConan(ConanFile):
     def configure(self):
         del self.settings.compiler.libcxx
         del self.settings.compiler.cppstd
+        if self.options.backend == "zlib-ng" and self.options.minizip:
+            raise ConanInvalidConfiguration("minizip is only available with backend=zlib")
 
     def source(self):
 
@@ -42,6 +48,9 @@ class ZlibConan(ConanFile):
         tools.patch(patch_file="minizip.patch", base_path=self._source_subfolder)
 
     def build(self):
+        if self.options.backend == "zlib-ng":
+            self._build_zlib_ng()
+            return
         self._build_zlib()
         if self.options.minizip:
             self._build_minizip()
@@ -103,6 +112,47 @@ class ZlibConan(ConanFile):
                 else:
                     self._build_zlib_cmake()
 
+    def _configure_cmake_zlib_ng(self):
+        cmake = CMake(self)
+        # zlib-ng in compat mode: same API/ABI and library name as zlib, with runtime-dispatched
+        # SIMD for crc32, adler32, longest_match and slide_hash
+        cmake.definitions["ZLIB_COMPAT"] = True
+        cmake.definitions["ZLIB_ENABLE_TESTS"] = False
+        cmake.definitions["WITH_NATIVE_INSTRUCTIONS"] = False
+        cmake.configure(source_folder=os.path.join(self.build_folder, self._zlib_ng_folder),
+                        build_folder=os.path.join(self._zlib_ng_folder, "_build"))
+        return cmake
+
+    def _build_zlib_ng(self):
+        # fetched here rather than in source(), so that only backend=zlib-ng depends on it
+        tools.mkdir(self._zlib_ng_folder)
+        with tools.chdir(self._zlib_ng_folder):
+            tools.get(**self.conan_data["sources"]["zlib-ng"])
+            os.rename("zlib-ng-2.0.6", "zlib_ng_subfolder")
+        shutil.copy("CMakeLists_zlib-ng.txt", os.path.join(self._zlib_ng_folder, "CMakeLists.txt"))
+        cmake = self._configure_cmake_zlib_ng()
+        cmake.build()
+
+    def _package_zlib_ng(self):
+        license_file = os.path.join(self._zlib_ng_folder, "zlib_ng_subfolder", "LICENSE.md")
+        tools.save(os.path.join(self.package_folder, "licenses", "LICENSE"), tools.load(license_file))
+        cmake = self._configure_cmake_zlib_ng()
+        cmake.install()
+        tools.rmdir(os.path.join(self.package_folder, "lib", "pkgconfig"))
+        tools.rmdir(os.path.join(self.package_folder, "lib", "cmake"))
+        tools.rmdir(os.path.join(self.package_folder, "share"))
+        if self.settings.os == "Windows":
+            # use the library names package_info() declares for stock zlib
+            lib_path = os.path.join(self.package_folder, "lib")
+            if self.settings.compiler == "Visual Studio":
+                current_lib = glob.glob(os.path.join(lib_path, "zlib*.lib"))[0]
+                if os.path.basename(current_lib) != "zlib.lib":
+                    os.rename(current_lib, os.path.join(lib_path, "zlib.lib"))
+            else:
+                for current_lib in glob.glob(os.path.join(lib_path, "libz*.a")):
+                    name = "libzlib.dll.a" if current_lib.endswith(".dll.a") else "libzlib.a"
+                    os.rename(current_lib, os.path.join(lib_path, name))
+
     def _build_minizip(self):
         minizip_dir = os.path.join(self._source_subfolder, 'contrib', 'minizip')
         os.rename("CMakeLists_minizip.txt", os.path.join(minizip_dir, 'CMakeLists.txt'))
@@ -130,6 +180,10 @@ class ZlibConan(ConanFile):
                     os.rename(current_lib, os.path.join(lib_path, "libzlib.a"))
 
     def package(self):
+        if self.options.backend == "zlib-ng":
+            self._package_zlib_ng()
+            return
+
         # Extract the License/s from the header to a file
         with tools.chdir(os.path.join(self.source_folder, self._source_subfolder)):
             tmp = tools.load("zlib.h")
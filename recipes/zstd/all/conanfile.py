@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import glob
 import os
 from conans import ConanFile, CMake, tools
 
@@ -17,8 +18,16 @@ class ZstdConan(ConanFile):
     exports_sources = ['CMakeLists.txt']
     generators = 'cmake'
     settings = "os", "arch", "compiler", "build_type"
-    options = {"shared": [True, False], "fPIC": [True, False]}
-    default_options = {"shared": False, "fPIC": True}
+    options = {"shared": [True, False],
+               "fPIC": [True, False],
+               "threading": [True, False],
+               "legacy_support": [True, False],
+               "build_programs": [True, False]}
+    default_options = {"shared": False,
+                       "fPIC": True,
+                       "threading": True,
+                       "legacy_support": False,
+                       "build_programs": False}
 
     @property
     def _source_subfolder(self):
@@ -39,8 +48,12 @@ class ZstdConan(ConanFile):
 
     def _configure_cmake(self):
         cmake = CMake(self)
-        cmake.definitions["ZSTD_BUILD_PROGRAMS"] = False
-        cmake.definitions["ZSTD_BUILD_STATIC"] = not self.options.shared
+        cmake.definitions["ZSTD_BUILD_PROGRAMS"] = self.options.build_programs
+        cmake.definitions["ZSTD_MULTITHREAD_SUPPORT"] = self.options.threading
+        cmake.definitions["ZSTD_LEGACY_SUPPORT"] = self.options.legacy_support
+        # the zstd program links the static library, so it is always built with
+        # build_programs and removed from shared packages in package()
+        cmake.definitions["ZSTD_BUILD_STATIC"] = not self.options.shared or self.options.build_programs
         cmake.definitions["ZSTD_BUILD_SHARED"] = self.options.shared
         cmake.configure()
         return cmake
@@ -54,8 +67,16 @@ class ZstdConan(ConanFile):
         cmake = self._configure_cmake()
         cmake.install()
         tools.rmdir(os.path.join(self.package_folder, "lib", "pkgconfig"))
+        if self.options.shared and self.options.build_programs:
+            for static_lib in glob.glob(os.path.join(self.package_folder, "lib", "*.a")) + \
+                              glob.glob(os.path.join(self.package_folder, "lib", "*_static.lib")):
+                os.remove(static_lib)
 
     def package_info(self):
         self.cpp_info.libs = tools.collect_libs(self)
-        if self.settings.os == "Linux":
+        if self.settings.os == "Linux" and self.options.threading:
             self.cpp_info.libs.append("pthread")
+        if self.options.build_programs:
+            bin_path = os.path.join(self.package_folder, "bin")
+            self.output.info("Appending PATH environment variable: {}".format(bin_path))
+            self.env_info.PATH.append(bin_path)
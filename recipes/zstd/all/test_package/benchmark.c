@@ -0,0 +1,147 @@
+/*
+ * Throughput benchmark for the packaged zstd library.
+ *
+ * Usage: benchmark <corpus size in MB> <output json>
+ *
+ * A deterministic corpus is generated in memory and compressed at several
+ * levels and worker counts; compression and decompression speed are written
+ * as JSON so runs on different hosts, compilers or package revisions can be
+ * compared.
+ */
+
+#define ZSTD_STATIC_LINKING_ONLY   /* ZSTD_compress2 and ZSTD_c_* in zstd < 1.4.0 */
+
+#include <stdlib.h>
+#include <stdio.h>
+#include <string.h>
+#include <time.h>
+#include <zstd.h>
+
+
+static const int kLevels[] = { 1, 3, 9, 19 };
+static const int kWorkers[] = { 0, 2, 4, 8 };
+
+
+static void* malloc_orDie(size_t size)
+{
+    void* const buff = malloc(size);
+    if (buff) return buff;
+    perror("malloc:");
+    exit(1);
+}
+
+static double now_seconds(void)
+{
+    struct timespec ts;
+    timespec_get(&ts, TIME_UTC);
+    return (double)ts.tv_sec + (double)ts.tv_nsec / 1e9;
+}
+
+/* Text-like records mixed with runs of pseudo-random bytes, from a fixed seed */
+static void generate_corpus(unsigned char* dst, size_t size)
+{
+    static const char* const words[] = {
+        "request", "response", "latency", "timestamp", "user_id", "session",
+        "GET", "POST", "/api/v1/items", "status", "200", "404", "error",
+        "compression", "payload", "{\"key\":", "\"value\"}", "\n", " ", ","
+    };
+    size_t const nbWords = sizeof(words) / sizeof(words[0]);
+    unsigned int state = 2463534242u;
+    size_t pos = 0;
+
+    while (pos < size) {
+        state ^= state << 13; state ^= state >> 17; state ^= state << 5;
+        if ((state & 0xF) == 0) {
+            /* incompressible run */
+            size_t run = 16 + (state >> 8) % 240;
+            while (run-- && pos < size) {
+                state ^= state << 13; state ^= state >> 17; state ^= state << 5;
+                dst[pos++] = (unsigned char)state;
+            }
+        } else {
+            const char* const word = words[(state >> 4) % nbWords];
+            size_t len = strlen(word);
+            if (len > size - pos) len = size - pos;
+            memcpy(dst + pos, word, len);
+            pos += len;
+        }
+    }
+}
+
+int main(int argc, const char** argv)
+{
+    long const sizeArg = argc > 1 ? strtol(argv[1], NULL, 10) : 256;
+    const char* const outName = argc > 2 ? argv[2] : "zstd_benchmark.json";
+    size_t sizeMB, srcSize, dstCapacity;
+    unsigned char *src, *dst, *roundTrip;
+    ZSTD_CCtx* cctx;
+    ZSTD_DCtx* dctx;
+    FILE* out;
+    size_t l, w;
+    int first = 1;
+
+    if (sizeArg <= 0) { fprintf(stderr, "invalid corpus size '%s', expected a positive number of MB\n", argv[1]); return 2; }
+    sizeMB = (size_t)sizeArg;
+    srcSize = sizeMB * 1024 * 1024;
+    dstCapacity = ZSTD_compressBound(srcSize);
+    src = malloc_orDie(srcSize);
+    dst = malloc_orDie(dstCapacity);
+    roundTrip = malloc_orDie(srcSize);
+    cctx = ZSTD_createCCtx();
+    dctx = ZSTD_createDCtx();
+    if (cctx == NULL || dctx == NULL) { fprintf(stderr, "failed to create zstd contexts\n"); return 10; }
+    out = fopen(outName, "w");
+    if (out == NULL) { perror(outName); return 3; }
+
+    generate_corpus(src, srcSize);
+    fprintf(out, "{\n  \"zstd_version\": \"%s\",\n  \"corpus_bytes\": %lu,\n  \"results\": [",
+            ZSTD_versionString(), (unsigned long)srcSize);
+
+    for (l = 0; l < sizeof(kLevels) / sizeof(kLevels[0]); ++l) {
+        for (w = 0; w < sizeof(kWorkers) / sizeof(kWorkers[0]); ++w) {
+            size_t cSize, dSize, ret;
+            double start, cSeconds, dSeconds;
+
+            ZSTD_CCtx_reset(cctx, ZSTD_reset_session_and_parameters);
+            ZSTD_CCtx_setParameter(cctx, ZSTD_c_compressionLevel, kLevels[l]);
+            ret = ZSTD_CCtx_setParameter(cctx, ZSTD_c_nbWorkers, kWorkers[w]);
+            if (ZSTD_isError(ret)) {
+                /* library built without multithreading support */
+                printf("level %2d workers %d: unsupported (%s)\n", kLevels[l], kWorkers[w], ZSTD_getErrorName(ret));
+                continue;
+            }
+
+            start = now_seconds();
+            cSize = ZSTD_compress2(cctx, dst, dstCapacity, src, srcSize);
+            cSeconds = now_seconds() - start;
+            if (ZSTD_isError(cSize)) { fprintf(stderr, "ZSTD_compress2() error : %s\n", ZSTD_getErrorName(cSize)); return 12; }
+
+            start = now_seconds();
+            dSize = ZSTD_decompressDCtx(dctx, roundTrip, srcSize, dst, cSize);
+            dSeconds = now_seconds() - start;
+            if (ZSTD_isError(dSize) || dSize != srcSize || memcmp(src, roundTrip, srcSize) != 0) {
+                fprintf(stderr, "round trip failed at level %d\n", kLevels[l]);
+                return 13;
+            }
+
+            printf("level %2d workers %d: ratio %.3f, compress %.1f MB/s, decompress %.1f MB/s\n",
+                   kLevels[l], kWorkers[w], (double)srcSize / cSize,
+                   sizeMB / cSeconds, sizeMB / dSeconds);
+            fprintf(out, "%s\n    {\"level\": %d, \"workers\": %d, \"compressed_bytes\": %lu, "
+                         "\"compress_mb_s\": %.2f, \"decompress_mb_s\": %.2f}",
+                    first ? "" : ",", kLevels[l], kWorkers[w], (unsigned long)cSize,
+                    sizeMB / cSeconds, sizeMB / dSeconds);
+            first = 0;
+        }
+    }
+
+    fprintf(out, "\n  ]\n}\n");
+    fclose(out);
+    ZSTD_freeCCtx(cctx);
+    ZSTD_freeDCtx(dctx);
+    free(src);
+    free(dst);
+    free(roundTrip);
+    printf("results written to %s\n", outName);
+    return 0;
+}
@@ -1,7 +1,7 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 import os
-from conans import ConanFile, CMake
+from conans import ConanFile, CMake, tools
 
 
 class TestPackageConan(ConanFile):
@@ -10,9 +10,15 @@ class TestPackageConan(ConanFile):
 
     def build(self):
         cmake = CMake(self)
+        cmake.definitions["BUILD_BENCHMARK"] = tools.get_env("CONAN_ZSTD_BENCHMARK", False)
         cmake.configure()
         cmake.build()
 
     def test(self):
         bin_path = os.path.join("bin", "test_package")
         self.run(bin_path, run_environment=True)
+        # Opt-in throughput benchmark: CONAN_ZSTD_BENCHMARK=1, corpus size from CONAN_ZSTD_BENCHMARK_MB
+        if tools.get_env("CONAN_ZSTD_BENCHMARK", False):
+            corpus_mb = tools.get_env("CONAN_ZSTD_BENCHMARK_MB", 256)
+            results = os.path.join(self.build_folder, "zstd_benchmark.json")
+            self.run("%s %s \"%s\"" % (os.path.join("bin", "benchmark"), corpus_mb, results), run_environment=True)